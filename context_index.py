@@ -0,0 +1,144 @@
+"""
+Local retrieval index over resume and job-description chunks (faiss + sentence-transformers).
+Each interview turn pulls only the few chunks relevant to the candidate's last answer,
+so prompt size stays constant no matter how long the documents are.
+"""
+import json
+import threading
+from pathlib import Path
+
+import faiss
+import numpy as np
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+INDEX_DIR = _SCRIPT_DIR / "context_index"
+EMBED_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+
+CHUNK_CHARS = 500
+CHUNK_OVERLAP = 100
+TOP_K = 3
+
+_embedder = None
+_index = None
+_chunks = []  # [{"source": "resume"|"jd", "text": str}], row-aligned with _index
+_lock = threading.Lock()
+_embedder_lock = threading.Lock()
+
+
+def _ensure_embedder():
+    global _embedder
+    with _embedder_lock:
+        if _embedder is None:
+            from sentence_transformers import SentenceTransformer
+            _embedder = SentenceTransformer(EMBED_MODEL, device="cpu")
+    return _embedder
+
+
+def warm() -> bool:
+    """
+    Load the embedder (and run one encode) if the index has documents, so the first
+    live turn's retrieve() doesn't pay the model load. Returns True if it was warmed.
+    """
+    if not has_documents():
+        return False
+    _embed(["warm up"])
+    return True
+
+
+def _embed(texts: list) -> np.ndarray:
+    vectors = _ensure_embedder().encode(texts, normalize_embeddings=True, batch_size=32)
+    return np.asarray(vectors, dtype="float32")
+
+
+def chunk_text(text: str, size: int = CHUNK_CHARS, overlap: int = CHUNK_OVERLAP) -> list:
+    """Split text into overlapping chunks, preferring paragraph/line boundaries."""
+    text = "\n".join(line.strip() for line in text.splitlines() if line.strip())
+    chunks = []
+    start = 0
+    while start < len(text):
+        end = min(len(text), start + size)
+        if end < len(text):
+            cut = text.rfind("\n", start + size // 2, end)
+            if cut != -1:
+                end = cut
+        chunk = text[start:end].strip()
+        if chunk:
+            chunks.append(chunk)
+        if end >= len(text):
+            break
+        # overlap starts on a line boundary when there is one inside the overlap
+        nl = text.find("\n", max(end - overlap, start + 1), end)
+        start = nl + 1 if nl != -1 else max(end - overlap, start + 1)
+    return chunks
+
+
+def _load():
+    global _index, _chunks
+    if _index is not None:
+        return
+    index_path = INDEX_DIR / "index.faiss"
+    chunks_path = INDEX_DIR / "chunks.json"
+    if index_path.exists() and chunks_path.exists():
+        _index = faiss.read_index(str(index_path))
+        _chunks = json.loads(chunks_path.read_text(encoding="utf-8"))
+    else:
+        _index, _chunks = None, []
+
+
+def _save():
+    INDEX_DIR.mkdir(exist_ok=True)
+    faiss.write_index(_index, str(INDEX_DIR / "index.faiss"))
+    (INDEX_DIR / "chunks.json").write_text(json.dumps(_chunks), encoding="utf-8")
+
+
+def index_document(text: str, source: str) -> int:
+    """
+    Replace all chunks of the given source ("resume" or "jd") with chunks of text.
+    Only the latest resume and job description are kept. Returns the chunk count.
+    """
+    global _index, _chunks
+    new_chunks = [{"source": source, "text": c} for c in chunk_text(text)]
+    new_vectors = _embed([c["text"] for c in new_chunks]) if new_chunks else None
+    with _lock:
+        _load()
+        keep = [i for i, c in enumerate(_chunks) if c["source"] != source]
+        old_vectors = (
+            _index.reconstruct_n(0, _index.ntotal)[keep]
+            if _index is not None and keep else None
+        )
+        parts = [v for v in (old_vectors, new_vectors) if v is not None]
+        dim = _ensure_embedder().get_sentence_embedding_dimension()
+        _index = faiss.IndexFlatIP(dim)
+        if parts:
+            _index.add(np.vstack(parts))
+        _chunks = [_chunks[i] for i in keep] + new_chunks
+        _save()
+    return len(new_chunks)
+
+
+def has_documents(source: str = None) -> bool:
+    """True if the index holds any chunks (of the given source, if one is given)."""
+    with _lock:
+        _load()
+        return any(source is None or c["source"] == source for c in _chunks)
+
+
+def source_text(source: str) -> str:
+    """All indexed chunks of one source ("resume" or "jd"), in document order."""
+    with _lock:
+        _load()
+        return "\n".join(c["text"] for c in _chunks if c["source"] == source)
+
+
+def retrieve(query: str, k: int = TOP_K) -> list:
+    """Return up to k chunks ({"source", "text", "score"}) most similar to query."""
+    with _lock:
+        _load()
+        if _index is None or not _chunks or not query.strip():
+            return []
+        scores, ids = _index.search(_embed([query]), min(k, len(_chunks)))
+        return [
+            {**_chunks[i], "score": float(s)}
+            for s, i in zip(scores[0], ids[0])
+            if i != -1
+        ]
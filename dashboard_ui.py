@@ -429,81 +429,127 @@ class HomeView(QWidget):
 
 
 class _FetchInterviewAnalysisWorker(QThread):
-    """Fetch interview logs and evaluations from S3, match by session_id."""
+    """
+    Fetch interview analysis for the Summary view from local storage. Each refresh first
+    pulls in the user's S3 objects and sessions recorded on other machines (skipped when
+    offline), then normally reads the manifest once; without a backfilled manifest all logs
+    and evaluations are read, matched by session_id, and written to the manifest.
+    """
     data_loaded = Signal(list)  # list of {session_id, log_data, evaluation_data, last_modified}
     error_occurred = Signal(str)
 
-    def __init__(self, s3_handler, username: str):
+    def __init__(self, storage, username: str):
         super().__init__()
-        self.s3_handler = s3_handler
+        self.storage = storage
         self.username = username
 
     def run(self):
         try:
-            # Fetch logs (username/logfile/*.json)
-            log_files = self.s3_handler.list_user_files(self.username, folder="logfile")
-            logs_by_session = {}
-            for f in log_files:
-                key = f.get("key", "")
-                if not key.endswith(".json") or ".evaluation." in key:
-                    continue
-                content = self.s3_handler.get_file_content(key)
-                if not content:
-                    continue
-                try:
-                    data = json.loads(content)
-                except json.JSONDecodeError:
-                    continue
-                # session_id from key: .../interview_log_20260207_061821.json
-                stem = key.split("/")[-1].replace(".json", "").replace("interview_log_", "")
-                logs_by_session[stem] = {"data": data, "last_modified": f.get("last_modified")}
-
-            # Fetch evaluations (username/evaluations/*.json)
-            eval_files = self.s3_handler.list_user_files(self.username, folder="evaluations")
-            evals_by_session = {}
-            for f in eval_files:
-                key = f.get("key", "")
-                if not key.endswith(".json"):
-                    continue
-                content = self.s3_handler.get_file_content(key)
-                if not content:
-                    continue
-                try:
-                    data = json.loads(content)
-                except json.JSONDecodeError:
-                    continue
-                stem = key.split("/")[-1].replace(".evaluation.json", "").replace("interview_log_", "")
-                evals_by_session[stem] = {"data": data, "last_modified": f.get("last_modified")}
-
-            # Combine: all sessions from logs, attach evaluation if present
-            combined = []
-            for session_id, log_item in logs_by_session.items():
-                eval_item = evals_by_session.get(session_id)
-                last_mod = log_item.get("last_modified") or eval_item.get("last_modified") if eval_item else log_item.get("last_modified")
-                combined.append({
-                    "session_id": session_id,
-                    "log_data": log_item["data"],
-                    "evaluation_data": eval_item["data"] if eval_item else None,
-                    "last_modified": last_mod,
-                })
-            combined.sort(key=lambda x: x.get("last_modified") or "", reverse=True)
+            self.storage.hydrate_from_remote(self.username)
+            manifest = self.storage.get_manifest(self.username)
+            if manifest and manifest.get("backfilled"):
+                combined = [self._item_from_manifest(e) for e in manifest.get("sessions", {}).values()]
+            else:
+                combined = self._fetch_all()
+            combined.sort(key=lambda x: str(x.get("last_modified") or ""), reverse=True)
             self.data_loaded.emit(combined)
         except Exception as e:
             self.error_occurred.emit(str(e))
 
+    @staticmethod
+    def _item_from_manifest(entry: dict) -> dict:
+        """Shape a manifest entry like the full log/evaluation data the cards render."""
+        log_data = {
+            "metadata": {"role": entry.get("role"), "difficulty": entry.get("difficulty")},
+            "qa_pairs": entry.get("qa_preview") or [],
+        }
+        evaluation_data = None
+        if entry.get("evaluation_key"):
+            evaluation_data = {
+                "overall_scores": entry.get("overall_scores"),
+                "hire_signal": entry.get("hire_signal"),
+                "confidence_level": entry.get("confidence_level"),
+                "final_feedback_for_candidate": entry.get("final_feedback_for_candidate") or {},
+            }
+        return {
+            "session_id": entry.get("session_id"),
+            "log_data": log_data,
+            "evaluation_data": evaluation_data,
+            "last_modified": entry.get("log_last_modified") or entry.get("evaluation_last_modified"),
+        }
+
+    def _fetch_all(self) -> list:
+        """Download every log and evaluation, then backfill the manifest from them."""
+        from s3_handler import manifest_entry_from_evaluation, manifest_entry_from_log
+
+        # List logs (username/logfile/*.json) and evaluations (username/evaluations/*.json),
+        # then download all of them in one parallel batch
+        log_files = [
+            f for f in self.storage.list_user_files(self.username, folder="logfile")
+            if f.get("key", "").endswith(".json") and ".evaluation." not in f.get("key", "")
+        ]
+        eval_files = [
+            f for f in self.storage.list_user_files(self.username, folder="evaluations")
+            if f.get("key", "").endswith(".json")
+        ]
+        contents = self.storage.get_many([f["key"] for f in log_files + eval_files])
+
+        def parsed(key):
+            try:
+                return json.loads(contents.get(key) or "")
+            except json.JSONDecodeError:
+                return None
+
+        logs_by_session = {}
+        entries = {}
+        for f in log_files:
+            key = f["key"]
+            data = parsed(key)
+            if data is None:
+                continue
+            # session_id from key: .../interview_log_20260207_061821.json
+            stem = key.split("/")[-1].replace(".json", "").replace("interview_log_", "")
+            logs_by_session[stem] = {"data": data, "last_modified": f.get("last_modified")}
+            entries[stem] = manifest_entry_from_log(data, key, f.get("last_modified"))
+
+        evals_by_session = {}
+        for f in eval_files:
+            key = f["key"]
+            data = parsed(key)
+            if data is None:
+                continue
+            stem = key.split("/")[-1].replace(".evaluation.json", "").replace("interview_log_", "")
+            evals_by_session[stem] = {"data": data, "last_modified": f.get("last_modified")}
+            entries.setdefault(stem, {}).update(manifest_entry_from_evaluation(data, key, f.get("last_modified")))
+
+        self.storage.update_manifest(self.username, entries, backfilled=True)
+
+        # Combine: all sessions from logs, attach evaluation if present
+        combined = []
+        for session_id, log_item in logs_by_session.items():
+            eval_item = evals_by_session.get(session_id)
+            last_mod = log_item.get("last_modified") or eval_item.get("last_modified") if eval_item else log_item.get("last_modified")
+            combined.append({
+                "session_id": session_id,
+                "log_data": log_item["data"],
+                "evaluation_data": eval_item["data"] if eval_item else None,
+                "last_modified": last_mod,
+            })
+        return combined
+
 
 class SummaryView(QWidget):
-    """Summary view: fetch interview logs + evaluations from S3, show analysis (no Q&A)."""
+    """Summary view: load interview logs + evaluations from storage, show analysis (no Q&A)."""
 
     def __init__(self):
         super().__init__()
         self.username = None
         self._fetch_worker = None
         try:
-            from s3_handler import S3Handler
-            self.s3_handler = S3Handler()
+            from storage import get_storage
+            self.storage = get_storage()
         except Exception:
-            self.s3_handler = None
+            self.storage = None
         self._setup_ui()
 
     def set_user(self, user_data):
@@ -559,7 +605,7 @@ class SummaryView(QWidget):
             QFrame { background-color: #0f172a; border: 2px solid #334155; border-radius: 12px; }
         """)
         recent_layout = QVBoxLayout()
-        recent_title = QLabel("Interview Analysis (from S3)")
+        recent_title = QLabel("Interview Analysis")
         recent_title_font = QFont()
         recent_title_font.setPointSize(16)
         recent_title_font.setBold(True)
@@ -575,7 +621,7 @@ class SummaryView(QWidget):
         self.logs_layout.setSpacing(12)
         self.logs_container.setLayout(self.logs_layout)
         self.logs_scroll.setWidget(self.logs_container)
-        self.empty_label = QLabel("No interviews yet.\nClick Refresh to load from S3.")
+        self.empty_label = QLabel("No interviews yet.\nClick Refresh to load.")
         self.empty_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         self.empty_label.setStyleSheet("color: #94a3b8; font-size: 14px; padding: 40px;")
         self.logs_layout.addWidget(self.empty_label)
@@ -619,12 +665,12 @@ class SummaryView(QWidget):
     def _on_refresh(self):
         if not self.username:
             return
-        if not self.s3_handler or not getattr(self.s3_handler, "s3_client", None):
-            self._show_empty("S3 not configured. Set AWS credentials and S3_BUCKET_NAME in .env")
+        if not self.storage:
+            self._show_empty("Storage unavailable.")
             return
         self.refresh_btn.setEnabled(False)
         self.loading_bar.setVisible(True)
-        self._fetch_worker = _FetchInterviewAnalysisWorker(self.s3_handler, self.username)
+        self._fetch_worker = _FetchInterviewAnalysisWorker(self.storage, self.username)
         self._fetch_worker.data_loaded.connect(self._on_data_loaded)
         self._fetch_worker.error_occurred.connect(self._on_error)
         self._fetch_worker.finished.connect(self._on_fetch_finished)
@@ -642,7 +688,7 @@ class SummaryView(QWidget):
             if w and w is not self.empty_label:
                 w.deleteLater()
         if len(combined) == 0:
-            self.empty_label.setText("No interview logs found in S3.")
+            self.empty_label.setText("No interview logs found.")
             self.logs_layout.addWidget(self.empty_label)
             return
         for item in combined:
@@ -733,7 +779,7 @@ class SummaryView(QWidget):
         return parts
 
     def _on_error(self, message: str):
-        self._show_empty(f"Error loading from S3: {message}")
+        self._show_empty(f"Error loading interviews: {message}")
 
     def _on_fetch_finished(self):
         self.refresh_btn.setEnabled(True)
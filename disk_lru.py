@@ -0,0 +1,231 @@
+"""
+Size-bounded on-disk LRU cache shared by the TTS, evaluation and S3 object caches.
+
+Entries are files in cache_dir; index.sqlite3 records each entry's file, size, last use
+and small metadata (e.g. an ETag). Writes and evictions run in one SQLite write
+transaction, so several processes can share a cache. Hits only read the file: last use
+is kept in memory and flushed to the index every FLUSH_SECONDS (and before evicting).
+"""
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+
+FLUSH_SECONDS = 30.0
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    key        TEXT PRIMARY KEY,
+    file       TEXT NOT NULL,
+    size       INTEGER NOT NULL,
+    last_used  REAL NOT NULL,
+    meta       TEXT
+)
+"""
+
+
+class DiskLRU:
+    # extension of entries written without one, and of files adopted from older layouts
+    default_ext = ""
+
+    def __init__(self, cache_dir: Path, max_bytes: int, max_entries: int = None):
+        self.cache_dir = Path(cache_dir)
+        self.max_bytes = max_bytes
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._rows = {}      # key -> {"file", "size", "meta"}; this process's view of the index
+        self._touched = {}   # key -> last use not yet written to the index
+        self._last_flush = time.monotonic()
+        self._ready = False
+
+    # ---- hooks ----
+    def _file_name(self, key: str, ext: str) -> str:
+        return f"{key}.{ext}" if ext else key
+
+    def _key_for_file(self, path: Path):
+        """(key, ext) of an entry file found on disk but not in the index; None deletes it."""
+        return path.stem, path.suffix.lstrip(".")
+
+    # ---- index ----
+    @contextmanager
+    def _connect(self, write: bool = False):
+        db = sqlite3.connect(self.cache_dir / "index.sqlite3", timeout=30, isolation_level=None)
+        try:
+            # IMMEDIATE takes the write lock up front, so concurrent processes serialize
+            db.execute("BEGIN IMMEDIATE" if write else "BEGIN")
+            yield db
+            db.execute("COMMIT")
+        except BaseException:
+            db.execute("ROLLBACK")
+            raise
+        finally:
+            db.close()
+
+    def _ensure_index(self) -> None:
+        if self._ready:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        with self._connect(write=True) as db:
+            db.execute(_SCHEMA)
+            self._migrate_index_json(db)
+            known = {row[0] for row in db.execute("SELECT file FROM entries")}
+            for path in self.cache_dir.iterdir():
+                if (path.name in known or path.name.startswith("index.") or path.suffix == ".tmp"
+                        or not path.is_file()):
+                    continue
+                # files the index does not know (interrupted writes, older layouts)
+                found = self._key_for_file(path)
+                if found is None:
+                    path.unlink(missing_ok=True)
+                    continue
+                st = path.stat()
+                db.execute(
+                    "INSERT OR IGNORE INTO entries (key, file, size, last_used) VALUES (?, ?, ?, ?)",
+                    (found[0], path.name, st.st_size, st.st_mtime),
+                )
+        self._ready = True
+
+    def _migrate_index_json(self, db) -> None:
+        # caches written before the SQLite index kept index.json: {key: {size, last_used, ...}}
+        path = self.cache_dir / "index.json"
+        try:
+            old = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            old = {}
+        for key, entry in old.items():
+            ext = entry.get("ext", self.default_ext)
+            meta = {k: v for k, v in entry.items() if k not in ("size", "last_used", "ext")}
+            db.execute(
+                "INSERT OR IGNORE INTO entries (key, file, size, last_used, meta) VALUES (?, ?, ?, ?, ?)",
+                (key, self._file_name(key, ext), entry.get("size", 0), entry.get("last_used", 0.0),
+                 json.dumps(meta) if meta else None),
+            )
+        path.unlink(missing_ok=True)
+
+    def _row(self, key: str) -> Optional[dict]:
+        row = self._rows.get(key)
+        if row is None:
+            # written by another process, or not loaded yet
+            with self._connect() as db:
+                found = db.execute(
+                    "SELECT file, size, meta FROM entries WHERE key = ?", (key,)
+                ).fetchone()
+            if found is None:
+                return None
+            row = {"file": found[0], "size": found[1], "meta": json.loads(found[2]) if found[2] else {}}
+            self._rows[key] = row
+        return row
+
+    def _flush(self, db) -> None:
+        if self._touched:
+            db.executemany(
+                "UPDATE entries SET last_used = ? WHERE key = ?",
+                [(t, k) for k, t in self._touched.items()],
+            )
+            self._touched.clear()
+        self._last_flush = time.monotonic()
+
+    def flush(self) -> None:
+        """Write pending last-use times to the index."""
+        with self._lock:
+            self._ensure_index()
+            with self._connect(write=True) as db:
+                self._flush(db)
+
+    # ---- entries ----
+    def meta(self, key: str) -> Optional[dict]:
+        """Metadata stored with key, or None if it is not cached."""
+        with self._lock:
+            self._ensure_index()
+            row = self._row(key)
+            return dict(row["meta"]) if row else None
+
+    def read(self, key: str) -> Optional[bytes]:
+        """Cached bytes (marks them recently used), or None."""
+        with self._lock:
+            self._ensure_index()
+            row = self._row(key)
+        if row is None:
+            return None
+        try:
+            data = (self.cache_dir / row["file"]).read_bytes()
+        except OSError:
+            self.discard(key)
+            return None
+        with self._lock:
+            self._touched[key] = time.time()
+            if time.monotonic() - self._last_flush > FLUSH_SECONDS:
+                with self._connect(write=True) as db:
+                    self._flush(db)
+        return data
+
+    def write(self, key: str, data: bytes, ext: str = None, meta: dict = None) -> None:
+        ext = self.default_ext if ext is None else ext
+        with self._lock:
+            self._ensure_index()
+            file_name = self._file_name(key, ext)
+            # unique temp name per writer; os.replace makes the entry appear atomically
+            fd, tmp = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            with self._connect(write=True) as db:
+                # inside the transaction, so no other process adopts or evicts it half-added
+                old = db.execute("SELECT file FROM entries WHERE key = ?", (key,)).fetchone()
+                os.replace(tmp, self.cache_dir / file_name)
+                if old and old[0] != file_name:
+                    (self.cache_dir / old[0]).unlink(missing_ok=True)
+                db.execute(
+                    "INSERT OR REPLACE INTO entries (key, file, size, last_used, meta) VALUES (?, ?, ?, ?, ?)",
+                    (key, file_name, len(data), time.time(), json.dumps(meta) if meta else None),
+                )
+                self._rows[key] = {"file": file_name, "size": len(data), "meta": meta or {}}
+                self._touched.pop(key, None)
+                self._flush(db)
+                self._evict(db)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._ensure_index()
+            self._rows.pop(key, None)
+            self._touched.pop(key, None)
+            with self._connect(write=True) as db:
+                row = db.execute("SELECT file FROM entries WHERE key = ?", (key,)).fetchone()
+                if row:
+                    db.execute("DELETE FROM entries WHERE key = ?", (key,))
+                    (self.cache_dir / row[0]).unlink(missing_ok=True)
+
+    def _evict(self, db) -> None:
+        count, total = db.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries").fetchone()
+
+        def over() -> bool:
+            return total > self.max_bytes or (self.max_entries is not None and count > self.max_entries)
+
+        if not over():
+            return
+        for key, file_name, size in db.execute(
+            "SELECT key, file, size FROM entries ORDER BY last_used"
+        ).fetchall():
+            if not over():
+                break
+            db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            (self.cache_dir / file_name).unlink(missing_ok=True)
+            self._rows.pop(key, None)
+            count -= 1
+            total -= size
+
+    def stats(self) -> dict:
+        with self._lock:
+            self._ensure_index()
+            with self._connect() as db:
+                count, total = db.execute(
+                    "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+                ).fetchone()
+        stats = {"entries": count, "bytes": total, "max_bytes": self.max_bytes}
+        if self.max_entries is not None:
+            stats["max_entries"] = self.max_entries
+        return stats
@@ -0,0 +1,208 @@
+"""
+Durable evaluation job queue (SQLite). Jobs are keyed by interview session id, so
+re-enqueueing the same interview is a no-op. A dedicated worker thread drains the queue,
+live interviews before recovered backlog; jobs left running by a crash go back to pending
+on startup, and logs in logs/ without an evaluation are picked up. Finished results stay
+flagged undelivered until the owner's client acknowledges them.
+"""
+import json
+import sqlite3
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+DB_PATH = _SCRIPT_DIR / "evaluations" / "queue.sqlite3"
+LOGS_DIR = _SCRIPT_DIR / "logs"
+MAX_ATTEMPTS = 3
+POLL_SECONDS = 2.0
+# claim() order: lower first, then oldest first
+PRIORITY_LIVE = 0
+PRIORITY_RECOVERED = 1
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    job_key     TEXT PRIMARY KEY,
+    log_path    TEXT NOT NULL,
+    username    TEXT,
+    status      TEXT NOT NULL DEFAULT 'pending',
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    result      TEXT,
+    error       TEXT,
+    delivered   INTEGER NOT NULL DEFAULT 0,
+    priority    INTEGER NOT NULL DEFAULT 0,
+    created_at  TEXT NOT NULL,
+    updated_at  TEXT NOT NULL
+)
+"""
+
+
+def session_id_from_log(log_path) -> str:
+    stem = Path(log_path).stem  # interview_log_20260207_082736
+    return stem.replace("interview_log_", "", 1) if stem.startswith("interview_log_") else stem
+
+
+class EvaluationQueue:
+    def __init__(self, db_path: Path = DB_PATH):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        with self._connect() as db:
+            db.execute(_SCHEMA)
+            columns = {row["name"] for row in db.execute("PRAGMA table_info(jobs)")}
+            if "priority" not in columns:
+                # queue created before jobs had a priority
+                db.execute("ALTER TABLE jobs ADD COLUMN priority INTEGER NOT NULL DEFAULT 0")
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.db_path, timeout=30)
+        db.row_factory = sqlite3.Row
+        try:
+            with db:  # commit on success, roll back on error
+                yield db
+        finally:
+            db.close()
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now().isoformat()
+
+    def enqueue(self, session_id: str, log_path, username: str = None,
+                priority: int = PRIORITY_LIVE) -> bool:
+        """Add a job for this session; returns False if one already exists."""
+        with self._lock, self._connect() as db:
+            cur = db.execute(
+                "INSERT OR IGNORE INTO jobs (job_key, log_path, username, priority, created_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (session_id, str(Path(log_path).resolve()), username, priority, self._now(), self._now()),
+            )
+        self.wake()
+        return cur.rowcount == 1
+
+    def recover(self, evaluations_dir: Path, logs_dir: Path = LOGS_DIR) -> int:
+        """
+        Startup recovery: requeue jobs interrupted mid-run and enqueue logs that have no
+        evaluation yet. Returns the number of jobs made runnable.
+        """
+        with self._lock, self._connect() as db:
+            n = db.execute(
+                "UPDATE jobs SET status = 'pending', updated_at = ? WHERE status = 'running'",
+                (self._now(),),
+            ).rowcount
+        for log_path in sorted(Path(logs_dir).glob("interview_log_*.json")):
+            if (Path(evaluations_dir) / f"{log_path.stem}.evaluation.json").exists():
+                continue
+            if self.enqueue(session_id_from_log(log_path), log_path, priority=PRIORITY_RECOVERED):
+                n += 1
+        return n
+
+    def claim(self):
+        """Mark the next pending job (live before recovered, then oldest) running and return it."""
+        with self._lock, self._connect() as db:
+            row = db.execute(
+                "SELECT * FROM jobs WHERE status = 'pending' ORDER BY priority, created_at LIMIT 1"
+            ).fetchone()
+            if row is None:
+                return None
+            db.execute(
+                "UPDATE jobs SET status = 'running', attempts = attempts + 1, updated_at = ? "
+                "WHERE job_key = ?",
+                (self._now(), row["job_key"]),
+            )
+            return dict(row, attempts=row["attempts"] + 1)
+
+    def complete(self, job_key: str, result: dict) -> None:
+        with self._lock, self._connect() as db:
+            db.execute(
+                "UPDATE jobs SET status = 'done', result = ?, error = NULL, updated_at = ? "
+                "WHERE job_key = ?",
+                (json.dumps(result), self._now(), job_key),
+            )
+
+    def fail(self, job_key: str, error: str, attempts: int) -> str:
+        """Record a failure; the job is retried until MAX_ATTEMPTS. Returns the new status."""
+        status = "failed" if attempts >= MAX_ATTEMPTS else "pending"
+        with self._lock, self._connect() as db:
+            db.execute(
+                "UPDATE jobs SET status = ?, error = ?, updated_at = ? WHERE job_key = ?",
+                (status, error, self._now(), job_key),
+            )
+        return status
+
+    def mark_delivered(self, job_key: str) -> None:
+        with self._lock, self._connect() as db:
+            db.execute("UPDATE jobs SET delivered = 1 WHERE job_key = ?", (job_key,))
+
+    def get(self, job_key: str):
+        with self._lock, self._connect() as db:
+            row = db.execute("SELECT * FROM jobs WHERE job_key = ?", (job_key,)).fetchone()
+        return dict(row) if row else None
+
+    def undelivered(self, username: str) -> list:
+        """
+        Finished (done or failed) jobs of this user not yet acknowledged by a client.
+        Recovered jobs have no owner and are only sent when a client asks for them by id.
+        """
+        if not username:
+            return []
+        with self._lock, self._connect() as db:
+            rows = db.execute(
+                "SELECT * FROM jobs WHERE status IN ('done', 'failed') AND delivered = 0 "
+                "AND username = ? ORDER BY updated_at",
+                (username,),
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def wait(self, timeout: float = POLL_SECONDS) -> None:
+        self._wake.wait(timeout)
+        self._wake.clear()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+
+class EvaluationWorker(threading.Thread):
+    """
+    Drains an EvaluationQueue one job at a time.
+    run_job(job) -> result dict; on_finished(job, result, error) is called after each
+    terminal outcome (error is None on success); on_idle() is called on every poll while
+    the queue is empty.
+    """
+
+    def __init__(self, queue: EvaluationQueue, run_job, on_finished=None, on_idle=None):
+        super().__init__(name="evaluation-worker", daemon=True)
+        self.queue = queue
+        self.run_job = run_job
+        self.on_finished = on_finished
+        self.on_idle = on_idle
+        self._stop_event = threading.Event()
+
+    def stop(self):
+        self._stop_event.set()
+        self.queue.wake()
+
+    def run(self):
+        while not self._stop_event.is_set():
+            job = self.queue.claim()
+            if job is None:
+                if self.on_idle:
+                    self.on_idle()
+                self.queue.wait()
+                continue
+            started = time.perf_counter()
+            try:
+                result = self.run_job(job)
+            except Exception as e:
+                status = self.queue.fail(job["job_key"], str(e), job["attempts"])
+                print(f"❌ Evaluation job {job['job_key']} failed ({status}): {e}")
+                if status == "failed" and self.on_finished:
+                    self.on_finished(job, None, str(e))
+                continue
+            self.queue.complete(job["job_key"], result)
+            print(f"✅ Evaluation job {job['job_key']} done in {time.perf_counter() - started:.1f}s")
+            if self.on_finished:
+                self.on_finished(job, result, None)
@@ -0,0 +1,64 @@
+"""
+Content-addressed cache of evaluation results in evaluations/cache/.
+The key is a hash of the normalized transcript plus everything the result depends on
+(evaluator.md hash, model hash, decoding parameters), so a retried or re-requested
+evaluation of the same interview is served without running the model.
+Least recently used entries are evicted once the entry or byte limit is exceeded; the
+index is shared with batch workers in other processes (see disk_lru).
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from disk_lru import DiskLRU
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+CACHE_DIR = _SCRIPT_DIR / "evaluations" / "cache"
+MAX_ENTRIES = int(os.getenv("EVAL_CACHE_MAX_ENTRIES", "500"))
+MAX_BYTES = int(os.getenv("EVAL_CACHE_MAX_BYTES", str(50 * 1024 * 1024)))
+
+
+def normalize_transcript(qa_pairs: list) -> str:
+    """Whitespace-insensitive transcript text used for the cache key."""
+    lines = []
+    for pair in qa_pairs:
+        lines.append("Q: " + " ".join(str(pair.get("question", "")).split()))
+        lines.append("A: " + " ".join(str(pair.get("answer", "")).split()))
+    return "\n".join(lines)
+
+
+def cache_key(qa_pairs: list, role: str, difficulty: str, fingerprint: dict) -> str:
+    payload = {
+        "transcript": normalize_transcript(qa_pairs),
+        "role": " ".join(str(role).split()),
+        "difficulty": str(difficulty).lower(),
+        "fingerprint": fingerprint,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class EvaluationCache(DiskLRU):
+    default_ext = "json"
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, max_entries: int = MAX_ENTRIES,
+                 max_bytes: int = MAX_BYTES):
+        super().__init__(cache_dir, max_bytes, max_entries=max_entries)
+
+    def get(self, key: str):
+        """Cached result for key, or None."""
+        data = self.read(key)
+        if data is None:
+            return None
+        try:
+            return json.loads(data.decode("utf-8"))
+        except (UnicodeDecodeError, json.JSONDecodeError):
+            self.discard(key)
+            return None
+
+    def put(self, key: str, result: dict) -> None:
+        self.write(key, json.dumps(result, ensure_ascii=False).encode("utf-8"))
+
+
+# Shared by run_evaluation callers in this process
+evaluation_cache = EvaluationCache()
@@ -0,0 +1,240 @@
+"""
+Per-answer evaluation during the interview. Each recorded Q/A pair is scored in the
+background on a low-priority worker; when the interview ends only a short aggregation
+call remains, and the result has the same schema as run_evaluation (evaluator.md).
+The same map (per answer) / reduce (aggregate) split evaluates finished transcripts
+that are too long for a single pass.
+"""
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+from start_evaluation import (
+    EVAL_N_CTX,
+    METRICS,
+    clamp_scores,
+    clamped_partial,
+    complete_json,
+    evaluation_fingerprint,
+    fit_tokens,
+    per_question_schema,
+    store_evaluation,
+    string_list_schema,
+    transcript_cache_key,
+)
+
+ANSWER_MAX_TOKENS = 450
+AGGREGATE_MAX_TOKENS = 500
+# Room for the question and answer in one map call (prompt and output reserved)
+ANSWER_INPUT_TOKENS = EVAL_N_CTX - ANSWER_MAX_TOKENS - 1024
+# Per-question digest text in the reduce call is cut to this many characters
+DIGEST_SUMMARY_CHARS = 400
+# Niceness for the background worker thread (Linux/macOS); live turns keep priority
+BACKGROUND_NICENESS = 10
+
+_ANSWER_PROMPT = """You are a professional interview evaluator scoring ONE interviewer question
+and the candidate's answer from a {role} interview at {difficulty} difficulty.
+Judge content, reasoning and clarity only, strictly from what was said; do not penalize
+accent, grammar or speaking speed. Scores are 0-5 (decimals allowed): 0 not demonstrated,
+1 poor, 2 weak, 3 acceptable, 4 good, 5 excellent. For metrics this answer gives no
+evidence on, use 0.
+ideal_answer_example: neutral, 3-6 sentences, no reference to the candidate, no invented
+experience. Return ONLY the JSON object."""
+
+_AGGREGATE_PROMPT = """You are a professional interview evaluator. You receive per-question
+evaluations (already scored) and averaged metric scores for a {role} interview at
+{difficulty} difficulty. Write the overall verdict from this evidence only: confidence
+level, hire signal, strengths, weaknesses, red flags (empty list if none) and constructive
+final feedback with exactly three actionable improvements. Return ONLY the JSON object."""
+
+
+def _lower_thread_priority():
+    if hasattr(os, "setpriority"):
+        try:
+            os.setpriority(os.PRIO_PROCESS, threading.get_native_id(), BACKGROUND_NICENESS)
+        except OSError:
+            pass
+
+
+_executor = ThreadPoolExecutor(
+    max_workers=1,
+    thread_name_prefix="answer-eval",
+    initializer=_lower_thread_priority,
+)
+
+
+def _answer_schema() -> dict:
+    schema = per_question_schema(include_question=False)
+    schema["properties"]["metric_scores"] = {
+        "type": "object",
+        "properties": {m: {"type": "number"} for m in METRICS},
+        "required": METRICS,
+        "additionalProperties": False,
+    }
+    schema["required"].append("metric_scores")
+    return schema
+
+
+def _aggregate_schema() -> dict:
+    return {
+        "type": "object",
+        "properties": {
+            "confidence_level": {"enum": ["low", "medium", "high"]},
+            "hire_signal": {
+                "enum": ["strong hire", "hire", "leaning hire", "leaning no hire", "no hire"],
+            },
+            "strengths": string_list_schema(5),
+            "weaknesses": string_list_schema(5),
+            "red_flags": string_list_schema(5),
+            "final_feedback_for_candidate": {
+                "type": "object",
+                "properties": {
+                    "overall_summary": {"type": "string"},
+                    "top_3_improvements": string_list_schema(3, min_items=3),
+                    "what_to_focus_on_next": {"type": "string"},
+                },
+                "required": ["overall_summary", "top_3_improvements", "what_to_focus_on_next"],
+                "additionalProperties": False,
+            },
+        },
+        "required": [
+            "confidence_level", "hire_signal", "strengths", "weaknesses", "red_flags",
+            "final_feedback_for_candidate",
+        ],
+        "additionalProperties": False,
+    }
+
+
+def evaluate_answer(role: str, difficulty: str, question: str, answer: str, stats: dict = None) -> dict:
+    """Score a single Q/A pair: a per_question_feedback entry plus per-metric scores."""
+    turn = fit_tokens(f"Interviewer: {question}\nCandidate: {answer}", ANSWER_INPUT_TOKENS)
+    messages = [
+        {"role": "system", "content": _ANSWER_PROMPT.format(role=role, difficulty=difficulty)},
+        {"role": "user", "content": turn},
+    ]
+    result = complete_json(messages, _answer_schema(), ANSWER_MAX_TOKENS, stats=stats)
+    result["metric_scores"] = {
+        m: min(5.0, max(0.0, float(v))) for m, v in result["metric_scores"].items()
+    }
+    return {"question": question, **result}
+
+
+def _clean_feedback(answer: dict) -> dict:
+    return {k: v for k, v in answer.items() if k != "metric_scores"}
+
+
+def aggregate_evaluations(role: str, difficulty: str, answers: list, stats: dict = None,
+                          on_partial=None) -> dict:
+    """
+    Reduce step: average per-answer metric scores and run one short call for the overall
+    verdict. answers are evaluate_answer results in question order.
+    """
+    overall = {}
+    for m in METRICS:
+        # 0 means "no evidence in this answer"; average only answers that spoke to m
+        evidence = [a["metric_scores"][m] for a in answers if a["metric_scores"][m] > 0]
+        overall[m] = round(sum(evidence) / len(evidence), 2) if evidence else 0.0
+    overall["overall_score"] = round(sum(overall[m] for m in METRICS) / len(METRICS), 2)
+    if on_partial:
+        for key, value in overall.items():
+            on_partial(f"overall_scores.{key}", value)
+
+    digest = [
+        {
+            "question": a["question"][:DIGEST_SUMMARY_CHARS],
+            "summary": a["candidate_answer_summary"][:DIGEST_SUMMARY_CHARS],
+            "score": a["score"],
+            "issues": a["issues"],
+            "what_was_missing": a["what_was_missing"],
+        }
+        for a in answers
+    ]
+    messages = [
+        {"role": "system", "content": _AGGREGATE_PROMPT.format(role=role, difficulty=difficulty)},
+        {"role": "user", "content": json.dumps({"overall_scores": overall, "per_question": digest}, indent=2)},
+    ]
+    verdict = complete_json(messages, _aggregate_schema(), AGGREGATE_MAX_TOKENS, stats=stats,
+                            on_field=on_partial)
+
+    return clamp_scores({
+        "role": role,
+        "difficulty": difficulty,
+        "overall_scores": overall,
+        "confidence_level": verdict["confidence_level"],
+        "hire_signal": verdict["hire_signal"],
+        "per_question_feedback": [_clean_feedback(a) for a in answers],
+        "strengths": verdict["strengths"],
+        "weaknesses": verdict["weaknesses"],
+        "red_flags": verdict["red_flags"],
+        "final_feedback_for_candidate": verdict["final_feedback_for_candidate"],
+    })
+
+
+def map_reduce_evaluation(role: str, difficulty: str, qa_pairs: list, stats: dict = None,
+                          on_partial=None) -> dict:
+    """
+    Evaluate a finished transcript turn by turn (each in its own fresh context) and merge
+    with aggregate_evaluations. Cost grows linearly with the number of turns.
+    """
+    difficulty = str(difficulty).lower()
+    answers = []
+    for i, p in enumerate(qa_pairs):
+        answers.append(
+            evaluate_answer(role, difficulty, p.get("question", ""), p.get("answer", ""), stats=stats)
+        )
+        if on_partial:
+            on_partial(f"per_question_feedback[{i}]", _clean_feedback(answers[-1]))
+    return aggregate_evaluations(role, difficulty, answers, stats=stats, on_partial=on_partial)
+
+
+class IncrementalEvaluator:
+    """Collects per-answer evaluations for one interview session."""
+
+    def __init__(self, role: str, difficulty: str):
+        self.role = role
+        self.difficulty = str(difficulty).lower()
+        self._pairs = {}    # question_number -> (question, answer)
+        self._futures = {}  # question_number -> Future[dict]
+
+    def submit(self, question_number: int, question: str, answer: str) -> None:
+        """Queue background scoring of one answer (call right after record_qa)."""
+        self._pairs[question_number] = (question, answer)
+        self._futures[question_number] = _executor.submit(
+            evaluate_answer, self.role, self.difficulty, question, answer
+        )
+
+    def _answer_result(self, number: int) -> dict:
+        try:
+            return self._futures[number].result()
+        except Exception as e:
+            # background scoring failed: redo it now rather than lose the question
+            print(f"⚠️ Per-answer evaluation {number} failed ({e}), retrying inline")
+            question, answer = self._pairs[number]
+            return evaluate_answer(self.role, self.difficulty, question, answer)
+
+    def finalize(self, log_path, on_partial=None) -> dict:
+        """
+        Wait for outstanding per-answer scores, run the short aggregation call, save to
+        evaluations/ (with provenance and a cache entry, keyed like run_evaluation) and
+        return the evaluator.md-shaped result.
+        """
+        on_partial = clamped_partial(on_partial)
+        log_path = Path(log_path).resolve()
+        started = time.perf_counter()
+        stats = {}
+        answers = []
+        for i, n in enumerate(sorted(self._pairs)):
+            answers.append(self._answer_result(n))
+            if on_partial:
+                on_partial(f"per_question_feedback[{i}]", _clean_feedback(answers[-1]))
+        result = aggregate_evaluations(self.role, self.difficulty, answers, stats=stats,
+                                       on_partial=on_partial)
+        fingerprint = evaluation_fingerprint()
+        key = transcript_cache_key(json.loads(log_path.read_text(encoding="utf-8")), fingerprint)
+        # latency and tokens cover what was left at the end (the per-answer calls ran earlier)
+        store_evaluation(log_path, result, key, fingerprint, "incremental",
+                         time.perf_counter() - started, stats)
+        return result
@@ -1,29 +1,226 @@
+import json
 import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
 from llama_cpp import Llama
 
+import context_index
+from job_scheduler import Priority, scheduler
+from resume_profile import load_profile_for, format_profile
+
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
 MODEL_PATH = os.path.join(SCRIPT_DIR, "models", "Llama-3.2-3B-Instruct-Q4_K_M.gguf")
 
 # Interview length: 5 questions total (opening + 4 follow-ups), then interview complete
 MAX_QUESTIONS = 5
 
+N_CTX = 4096
+QUESTION_MAX_TOKENS = 120
+
+# Conversation window: system prompts + the last CONTEXT_KEEP_TURNS turns are sent
+# verbatim; older turns are folded into a rolling summary in the background so the
+# prompt (and per-turn prefill) stays bounded however long the interview runs.
+CONTEXT_KEEP_TURNS = 4
+CONTEXT_TOKEN_BUDGET = N_CTX - QUESTION_MAX_TOKENS - 256
+SUMMARY_MAX_TOKENS = 160
+
+# Optional speculative decoding: a small draft GGUF sharing the 3B tokenizer
+# (e.g. models/Llama-3.2-1B-Instruct-Q4_K_M.gguf). Unset = plain decoding.
+DRAFT_MODEL_PATH = os.getenv("DRAFT_MODEL_PATH", "")
+
+# Optional model routing: a fast small GGUF for light follow-ups, the 3B model for
+# deep technical turns. Unset = every turn uses the 3B model.
+SMALL_MODEL_PATH = os.getenv("SMALL_MODEL_PATH", "")
+# Up-front plan: one background call drafts the follow-up questions at setup; each
+# turn then only adapts the next planned item, with a much smaller output budget.
+PLAN_MAX_TOKENS = 400
+PLAN_ADAPT_MAX_TOKENS = 60
+PLAN_MIN_ANSWER_WORDS = 8
+# resume / JD text given to the planner (~1500 tokens together, well inside N_CTX)
+PLAN_RESUME_CHARS = 3500
+PLAN_JD_CHARS = 2500
+_OFF_PLAN_HINTS = (
+    "don't know", "do not know", "not sure", "not familiar", "haven't worked",
+    "have not worked", "never worked", "never used", "no experience", "haven't used",
+    "can you repeat", "could you repeat", "didn't understand",
+)
+
+ROUTER_SHORT_ANSWER_WORDS = 25
+ROUTER_DEEP_ANSWER_WORDS = 60
+
+_TECHNICAL_HINTS = (
+    "how would you", "how does", "how do you", "design", "implement", "architecture",
+    "algorithm", "complexity", "trade-off", "tradeoff", "scale", "optimi", "debug",
+    "why did you choose", "data structure", "performance", "concurrency",
+)
+_BEHAVIORAL_HINTS = (
+    "tell me about a time", "describe a situation", "give me an example", "conflict",
+    "challenge you faced", "team", "disagree", "mistake", "feedback",
+)
+
 _llm = None
+_draft = None
+_small_llm = None
+# running seconds-per-token for each routed model, used to estimate latency savings
+_sec_per_token = {"small": None, "large": None}
+# llama.cpp contexts are not thread-safe; the summariser shares the model with turns
+_llm_lock = threading.Lock()
+# models load lazily from turns, plans, summaries and resume distillation at once
+_load_lock = threading.Lock()
+# live turns queued for the interview model; background decodes stop for them
+_live_waiting = 0
+_live_waiting_cond = threading.Condition()
+# a background call is restarted at most this often, then runs to completion
+BACKGROUND_MAX_RESTARTS = 5
+# background LLM work (context summaries, interview plans) runs off the turn path
+_background_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="interview-bg")
 
 
 def _ensure_model():
-    global _llm
-    if _llm is not None:
-        return
-    _llm = Llama(
-        model_path=MODEL_PATH,
-        n_ctx=4096,
-        n_threads=8,
-        n_gpu_layers=0,
-        temperature=0.15,
-        repeat_penalty=1.1,
-        verbose=False,
-    )
+    global _llm, _draft
+    with _load_lock:
+        if _llm is not None:
+            return
+        draft = None
+        if DRAFT_MODEL_PATH:
+            from speculative import GGUFDraftModel
+            draft_path = os.path.join(SCRIPT_DIR, DRAFT_MODEL_PATH)
+            draft = GGUFDraftModel(draft_path, n_ctx=N_CTX)
+            print(f"✅ Speculative decoding enabled with draft {os.path.basename(draft_path)}")
+        llm = Llama(
+            model_path=MODEL_PATH,
+            n_ctx=N_CTX,
+            n_threads=8,
+            n_gpu_layers=0,
+            temperature=0.15,
+            repeat_penalty=1.1,
+            draft_model=draft,
+            verbose=False,
+        )
+        # set together, so _draft is always the draft attached to _llm
+        _llm, _draft = llm, draft
+
+
+def _ensure_small_model():
+    global _small_llm
+    _ensure_model()
+    with _load_lock:
+        if _small_llm is not None:
+            return
+        if _draft is not None and SMALL_MODEL_PATH == DRAFT_MODEL_PATH:
+            # same GGUF as the speculative draft: share it instead of loading twice
+            _small_llm = _draft.llm
+            return
+        _small_llm = Llama(
+            model_path=os.path.join(SCRIPT_DIR, SMALL_MODEL_PATH),
+            n_ctx=N_CTX,
+            n_threads=8,
+            n_gpu_layers=0,
+            verbose=False,
+        )
+
+
+class _Preempted(Exception):
+    """A background decode stopped because a live turn is waiting for the model."""
+
+
+def _live_done_waiting() -> None:
+    global _live_waiting
+    with _live_waiting_cond:
+        _live_waiting -= 1
+        _live_waiting_cond.notify_all()
+
+
+@contextmanager
+def _model_turn(priority: Priority):
+    """
+    CPU slot first, then the model lock. (Evaluation takes its own model lock before its
+    slot; the locks are distinct, so the two orders cannot deadlock.) Live turns are
+    counted while they wait so running background decodes can get out of the way.
+    """
+    global _live_waiting
+    live = priority == Priority.LIVE_TURN
+    if live:
+        with _live_waiting_cond:
+            _live_waiting += 1
+    try:
+        with scheduler.slot(priority), _llm_lock:
+            if live:
+                _live_done_waiting()
+                live = False
+            yield
+    finally:
+        if live:
+            _live_done_waiting()
+
+
+def _completion(messages: list, model: str = "large",
+                priority: Priority = Priority.LIVE_TURN, **kwargs) -> dict:
+    _ensure_model()
+    if model == "small":
+        _ensure_small_model()
+    with _model_turn(priority):
+        if model == "small":
+            return _small_llm.create_chat_completion(messages=messages, **kwargs)
+        if _draft is None:
+            return _llm.create_chat_completion(messages=messages, **kwargs)
+        _draft.begin()
+        before = _draft.stats()
+        output = _llm.create_chat_completion(messages=messages, **kwargs)
+        after = _draft.stats()
+    output["draft"] = {
+        k: after[k] - before[k] for k in ("proposed_tokens", "accepted_tokens")
+    }
+    return output
+
+
+def _stream_background(messages: list, priority: Priority, preemptible: bool, **kwargs) -> str:
+    # A live turn needs this model's lock, which cannot be handed over mid-decode, so the
+    # decode is abandoned for it. ASR only needs a CPU slot: checkpoint() lends it ours.
+    # If a live turn queues while the slot is lent out, it would take the slot and then
+    # wait for our lock, so checkpoint() aborts and we stop instead of waiting for it.
+    with _model_turn(priority):
+        stream = _llm.create_chat_completion(messages=messages, stream=True, **kwargs)
+        parts = []
+        try:
+            for chunk in stream:
+                parts.append(chunk["choices"][0]["delta"].get("content") or "")
+                if preemptible and _live_waiting:
+                    raise _Preempted()
+                # not preemptible: on abort keep the slot (briefly over the limit) and finish
+                if not scheduler.checkpoint(priority, abort=lambda: _live_waiting > 0) and preemptible:
+                    raise _Preempted()
+        finally:
+            if hasattr(stream, "close"):
+                stream.close()
+    return "".join(parts)
+
+
+def chat_completion(messages: list, priority: Priority = Priority.EVALUATION, **kwargs) -> str:
+    """
+    Run one chat completion on the shared interview model and return its text.
+    Defaults to background priority: the call streams, and if a live turn starts waiting
+    it stops and restarts after that turn (up to BACKGROUND_MAX_RESTARTS times), so
+    summaries, plans and resume distillation never delay a question by a whole decode.
+    """
+    if priority == Priority.LIVE_TURN:
+        output = _completion(messages, priority=priority, **kwargs)
+        return output["choices"][0]["message"]["content"].strip()
+    _ensure_model()
+    for attempt in range(BACKGROUND_MAX_RESTARTS + 1):
+        try:
+            return _stream_background(
+                messages, priority, preemptible=attempt < BACKGROUND_MAX_RESTARTS, **kwargs
+            ).strip()
+        except _Preempted:
+            scheduler.record_preemption(priority)
+            # the model lock is not fair: with spare CPU slots a restart could take it
+            # again before the live turn does, so let every waiting turn in first
+            with _live_waiting_cond:
+                _live_waiting_cond.wait_for(lambda: _live_waiting == 0)
 
 
 def get_opening(role: str) -> str:
@@ -39,14 +236,27 @@ def get_closing() -> str:
     )
 
 
+def _read_resume_text() -> str:
+    resume_path = os.path.join(SCRIPT_DIR, "resume_text.md")
+    if not os.path.exists(resume_path):
+        return ""
+    with open(resume_path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
 def create_interview_session(role: str, difficulty: str) -> dict:
     with open(os.path.join(SCRIPT_DIR, "interview_prompt.md"), "r", encoding="utf-8") as f:
         system_prompt_template = f.read()
-    resume_path = os.path.join(SCRIPT_DIR, "resume_text.md")
-    resume_text = ""
-    if os.path.exists(resume_path):
-        with open(resume_path, "r", encoding="utf-8") as f:
-            resume_text = f.read()
+    resume_text = _read_resume_text()
+    # prefer the distilled profile when it was built from this exact resume; when the
+    # resume itself is indexed the raw text is not pasted at all, excerpts come per turn
+    # instead (a JD-only index still needs the resume here)
+    retrieval = _retrieval_available()
+    profile = load_profile_for(resume_text) if resume_text else None
+    if profile:
+        resume_text = format_profile(profile)
+    elif retrieval and _retrieval_available("resume"):
+        resume_text = "(Relevant resume and job description excerpts are provided each turn.)"
     system_prompt = (
         system_prompt_template
         .replace("{ROLE}", role)
@@ -81,6 +291,11 @@ def create_interview_session(role: str, difficulty: str) -> dict:
         "session_id": session_id,
         "conversation_log": conversation_log,
         "current_question": None,
+        # rolling summary of turns that fell out of the verbatim window
+        "context": {"summary": "", "summarized_turns": 0, "pending": None},
+        "retrieval": retrieval,
+        # filled in the background by start_interview_plan
+        "plan": {"items": [], "next": 0, "ready": False},
     }
 
 
@@ -94,18 +309,353 @@ def record_qa(session: dict, question: str, answer: str) -> None:
     })
 
 
+def count_tokens(text: str) -> int:
+    """Token count with the loaded model's tokenizer (rough 4 chars/token before load)."""
+    if _llm is None:
+        return max(1, len(text) // 4)
+    return len(_llm.tokenize(text.encode("utf-8"), add_bos=False, special=True))
+
+
+def _message_tokens(message: dict) -> int:
+    # + chat template header/footer tokens per message
+    return count_tokens(message["content"]) + 5
+
+
+def _split_messages(session: dict):
+    """Return (system messages, conversation turns) from the session history."""
+    messages = session["messages"]
+    n_system = 0
+    while n_system < len(messages) and messages[n_system]["role"] == "system":
+        n_system += 1
+    return messages[:n_system], messages[n_system:]
+
+
+def _last_answer(turns: list) -> str:
+    """Text of the candidate's most recent response (without the message prefix)."""
+    for message in reversed(turns):
+        if message["role"] == "user":
+            return message["content"].replace("Candidate response: ", "", 1)
+    return ""
+
+
+def build_context(session: dict) -> list:
+    """
+    Messages to send for the next turn: system prompts, the rolling summary of
+    folded turns, then the most recent turns verbatim, trimmed to CONTEXT_TOKEN_BUDGET.
+    Never waits for a pending summary; turns not yet folded are simply left out.
+    """
+    system, turns = _split_messages(session)
+    ctx = session.setdefault("context", {"summary": "", "summarized_turns": 0, "pending": None})
+    recent = turns[max(ctx["summarized_turns"], len(turns) - CONTEXT_KEEP_TURNS):]
+
+    head = list(system)
+    if ctx["summary"]:
+        head.append({
+            "role": "system",
+            "content": f"Summary of the interview so far (read-only):\n{ctx['summary']}",
+        })
+    if session.get("retrieval"):
+        excerpts = _retrieve_excerpts(turns)
+        if excerpts:
+            head.append({"role": "system", "content": excerpts})
+    budget = CONTEXT_TOKEN_BUDGET - sum(_message_tokens(m) for m in head)
+    kept = []
+    for message in reversed(recent):
+        cost = _message_tokens(message)
+        if kept and cost > budget:
+            break
+        kept.append(message)
+        budget -= cost
+    return head + list(reversed(kept))
+
+
+def _retrieval_available(source: str = None) -> bool:
+    try:
+        return context_index.has_documents(source)
+    except Exception as e:
+        print(f"⚠️ Context index unavailable: {e}")
+        return False
+
+
+def _retrieve_excerpts(turns: list) -> str:
+    """Resume/JD chunks most relevant to the candidate's last answer, as a system block."""
+    last_answer = _last_answer(turns)
+    if not last_answer:
+        return ""
+    try:
+        chunks = context_index.retrieve(last_answer)
+    except Exception as e:
+        print(f"⚠️ Context retrieval failed: {e}")
+        return ""
+    if not chunks:
+        return ""
+    labels = {"resume": "Resume", "jd": "Job description"}
+    body = "\n".join(f"[{labels.get(c['source'], c['source'])}] {c['text']}" for c in chunks)
+    return f"Relevant resume / job description excerpts (read-only):\n<<<<\n{body}\n>>>>"
+
+
+def _summarize_turns(previous_summary: str, turns: list) -> str:
+    transcript = "\n".join(
+        ("Candidate" if m["role"] == "user" else "Interviewer") + ": "
+        + m["content"].replace("Candidate response: ", "", 1)
+        for m in turns
+    )
+    messages = [
+        {
+            "role": "system",
+            "content": (
+                "You compress interview transcripts. Write a terse factual summary "
+                "(max 120 words) of topics covered, the candidate's key claims and any "
+                "gaps. No preamble."
+            ),
+        },
+        {
+            "role": "user",
+            "content": f"Existing summary:\n{previous_summary or '(none)'}\n\nNew turns:\n{transcript}",
+        },
+    ]
+    return chat_completion(messages, max_tokens=SUMMARY_MAX_TOKENS, temperature=0.0)
+
+
+def _schedule_summary(session: dict) -> None:
+    """Fold turns that left the verbatim window into the summary, off the critical path."""
+    _, turns = _split_messages(session)
+    ctx = session["context"]
+    fold_upto = len(turns) - CONTEXT_KEEP_TURNS
+    if ctx["pending"] is not None or fold_upto <= ctx["summarized_turns"]:
+        return
+    to_fold = turns[ctx["summarized_turns"]:fold_upto]
+    previous = ctx["summary"]
+
+    def job():
+        try:
+            ctx["summary"] = _summarize_turns(previous, to_fold)
+            ctx["summarized_turns"] = fold_upto
+        except Exception as e:
+            print(f"❌ Context summary failed: {e}")
+        finally:
+            ctx["pending"] = None
+
+    ctx["pending"] = True
+    _background_executor.submit(job)
+
+
+def _record_decoding(session: dict, output: dict, elapsed: float) -> None:
+    """Accumulate decode throughput (and draft acceptance) in conversation_log.metadata."""
+    tokens = output.get("usage", {}).get("completion_tokens", 0)
+    stats = session["conversation_log"]["metadata"].setdefault("decoding", {
+        "speculative": _draft is not None,
+        "draft_model": os.path.basename(DRAFT_MODEL_PATH) if _draft is not None else None,
+        "completion_tokens": 0,
+        "decode_seconds": 0.0,
+        "proposed_tokens": 0,
+        "accepted_tokens": 0,
+    })
+    stats["completion_tokens"] += tokens
+    stats["decode_seconds"] = round(stats["decode_seconds"] + elapsed, 3)
+    if stats["decode_seconds"]:
+        stats["tokens_per_second"] = round(stats["completion_tokens"] / stats["decode_seconds"], 2)
+    if "draft" in output:
+        stats["proposed_tokens"] += output["draft"]["proposed_tokens"]
+        stats["accepted_tokens"] += output["draft"]["accepted_tokens"]
+        if stats["proposed_tokens"]:
+            stats["acceptance_rate"] = round(stats["accepted_tokens"] / stats["proposed_tokens"], 3)
+        print(
+            f"⚡ {tokens} tokens in {elapsed:.2f}s, "
+            f"draft acceptance {stats.get('acceptance_rate', 0.0):.0%}"
+        )
+
+
+def classify_question(question: str) -> str:
+    """Cheap keyword classification into text_to_speech.QuestionType values."""
+    q = (question or "").lower()
+    if any(h in q for h in _BEHAVIORAL_HINTS):
+        return "behavioral"
+    if any(h in q for h in _TECHNICAL_HINTS):
+        return "technical"
+    return "followup"
+
+
+def route_turn(session: dict, answer: str) -> tuple:
+    """
+    Pick "small" or "large" for the next question from cheap signals: turn index,
+    answer length, difficulty and the type of the question just answered.
+    Returns (model, reason).
+    """
+    if not SMALL_MODEL_PATH:
+        return "large", "small model not configured"
+    words = len(answer.split())
+    difficulty = session["conversation_log"]["metadata"].get("difficulty", "MEDIUM")
+    question_type = classify_question(session.get("current_question") or "")
+    if difficulty == "HARD":
+        return "large", "hard difficulty"
+    if question_type == "technical" and words >= ROUTER_DEEP_ANSWER_WORDS:
+        return "large", "deep technical answer"
+    if words < ROUTER_SHORT_ANSWER_WORDS:
+        return "small", "short answer"
+    if session.get("question_count", 1) <= 1:
+        return "small", "introduction turn"
+    if question_type == "behavioral":
+        return "small", "behavioral follow-up"
+    return "large", f"{question_type} answer"
+
+
+def _record_routing(session: dict, model: str, reason: str, output: dict, elapsed: float) -> None:
+    """Log the router decision and estimated latency saved in conversation_log.metadata."""
+    tokens = output.get("usage", {}).get("completion_tokens", 0)
+    if tokens:
+        per_token = elapsed / tokens
+        prev = _sec_per_token[model]
+        _sec_per_token[model] = per_token if prev is None else 0.7 * prev + 0.3 * per_token
+    saved = None
+    if model == "small" and tokens and _sec_per_token["large"] is not None:
+        saved = round(_sec_per_token["large"] * tokens - elapsed, 3)
+
+    routing = session["conversation_log"]["metadata"].setdefault("routing", {
+        "decisions": [],
+        "small_turns": 0,
+        "large_turns": 0,
+        "estimated_seconds_saved": 0.0,
+    })
+    routing["decisions"].append({
+        "question_number": session.get("question_count", 1) + 1,
+        "model": model,
+        "reason": reason,
+        "completion_tokens": tokens,
+        "latency_seconds": round(elapsed, 3),
+        "estimated_seconds_saved": saved,
+    })
+    routing[f"{model}_turns"] += 1
+    if saved is not None:
+        routing["estimated_seconds_saved"] = round(routing["estimated_seconds_saved"] + saved, 3)
+
+
+def _plan_context() -> str:
+    """
+    Resume (distilled profile, else raw text, else indexed chunks) and job description
+    for the planner. The session's resume message may only be the retrieval placeholder.
+    """
+    resume_text = _read_resume_text()
+    profile = load_profile_for(resume_text) if resume_text else None
+    resume = format_profile(profile) if profile else resume_text.strip()
+    if not resume and _retrieval_available("resume"):
+        resume = context_index.source_text("resume")
+    jd = context_index.source_text("jd") if _retrieval_available("jd") else ""
+    parts = []
+    if resume:
+        parts.append(f"Resume:\n{resume[:PLAN_RESUME_CHARS]}")
+    if jd:
+        parts.append(f"Job description:\n{jd[:PLAN_JD_CHARS]}")
+    return "\n\n".join(parts) or "(no resume or job description provided)"
+
+
+def _build_plan(session: dict) -> list:
+    metadata = session["conversation_log"]["metadata"]
+    n_items = session.get("max_questions", MAX_QUESTIONS) - 1
+    resume_context = _plan_context()
+    messages = [
+        {
+            "role": "system",
+            "content": (
+                "You plan job interviews. Return ONLY a JSON object "
+                '{"plan": [{"topic": "<short topic>", "question": "<one interview question>"}]} '
+                f"with exactly {n_items} items, ordered from warm-up to deepest. Each question "
+                "is one spoken sentence that a calm, concise interviewer would ask."
+            ),
+        },
+        {
+            "role": "user",
+            "content": (
+                f"Role: {metadata['role']}\nDifficulty: {metadata['difficulty']}\n\n{resume_context}"
+            ),
+        },
+    ]
+    raw = chat_completion(
+        messages,
+        max_tokens=PLAN_MAX_TOKENS,
+        temperature=0.2,
+        response_format={"type": "json_object"},
+    )
+    items = json.loads(raw).get("plan", [])
+    return [
+        {"topic": str(i.get("topic", "")).strip(), "question": str(i["question"]).strip()}
+        for i in items
+        if isinstance(i, dict) and str(i.get("question", "")).strip()
+    ][:n_items]
+
+
+def start_interview_plan(session: dict) -> None:
+    """Draft the interview plan in the background; turns use free generation until it lands."""
+    plan = session["plan"]
+
+    def job():
+        try:
+            plan["items"] = _build_plan(session)
+            session["conversation_log"]["metadata"]["plan"] = {
+                "items": plan["items"],
+                "adapted_turns": 0,
+                "free_turns": 0,
+            }
+            print(f"✅ Interview plan ready ({len(plan['items'])} items)")
+        except Exception as e:
+            print(f"❌ Interview plan failed, using free generation: {e}")
+        finally:
+            plan["ready"] = True
+
+    _background_executor.submit(job)
+
+
+def _next_planned_item(session: dict, answer: str):
+    """The next plan item if the plan is ready, not exhausted and the answer stayed on-plan."""
+    plan = session.get("plan")
+    if not plan or not plan["ready"] or plan["next"] >= len(plan["items"]):
+        return None
+    lowered = answer.lower()
+    if len(answer.split()) < PLAN_MIN_ANSWER_WORDS or any(h in lowered for h in _OFF_PLAN_HINTS):
+        return None
+    return plan["items"][plan["next"]]
+
+
 def generate_question(session: dict) -> str:
     _ensure_model()
-    messages = session["messages"].copy()
-    output = _llm.create_chat_completion(
-        messages=messages,
-        max_tokens=120,
+    messages = build_context(session)
+    _, turns = _split_messages(session)
+    answer = _last_answer(turns)
+    model, reason = route_turn(session, answer)
+
+    planned = _next_planned_item(session, answer)
+    max_tokens = QUESTION_MAX_TOKENS
+    if planned is not None:
+        messages.append({
+            "role": "system",
+            "content": (
+                f"Next planned question (topic: {planned['topic']}): {planned['question']}\n"
+                "Ask it now, lightly adapted to the candidate's last answer. "
+                "One short sentence, exactly one question."
+            ),
+        })
+        max_tokens = PLAN_ADAPT_MAX_TOKENS
+
+    start = time.perf_counter()
+    output = _completion(
+        messages,
+        model=model,
+        max_tokens=max_tokens,
         temperature=0.15,
         repeat_penalty=1.1,
     )
+    elapsed = time.perf_counter() - start
+    _record_decoding(session, output, elapsed)
+    _record_routing(session, model, reason, output, elapsed)
+    plan_stats = session["conversation_log"]["metadata"].get("plan")
+    if planned is not None:
+        session["plan"]["next"] += 1
+    if plan_stats is not None:
+        plan_stats["adapted_turns" if planned is not None else "free_turns"] += 1
     text = output["choices"][0]["message"]["content"].strip()
     for bad in ["Candidate:", "candidate:"]:
         text = text.replace(bad, "")
+    _schedule_summary(session)
     return text.strip()
 
 
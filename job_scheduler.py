@@ -0,0 +1,121 @@
+"""
+CPU-aware priority scheduler shared by everything that competes for the desktop's cores.
+
+Priority classes, highest first: live interview turn > ASR > evaluation > upload.
+CPU jobs hold one of a fixed number of slots (cores / threads per model). Background LLM
+jobs call checkpoint() between decode steps and hand their slot over whenever a
+higher-priority job is waiting; each hand-over is counted as a preemption.
+Uploads are I/O-bound and never hold a CPU slot, so they cannot slow the other classes.
+"""
+import os
+import threading
+import time
+from contextlib import contextmanager
+from enum import IntEnum
+
+# llama.cpp models in this repo run with n_threads=8
+THREADS_PER_JOB = 8
+
+
+class Priority(IntEnum):
+    LIVE_TURN = 0
+    ASR = 1
+    EVALUATION = 2
+    UPLOAD = 3
+
+
+class JobScheduler:
+    def __init__(self, cpu_slots: int = None):
+        self.cpu_slots = cpu_slots or max(1, (os.cpu_count() or THREADS_PER_JOB) // THREADS_PER_JOB)
+        self._cond = threading.Condition()
+        self._running = 0
+        self._waiting = {p: 0 for p in Priority}
+        self._completed = {p.name.lower(): 0 for p in Priority}
+        self._preemptions = {p.name.lower(): 0 for p in Priority}
+        self._wait_seconds = {p.name.lower(): 0.0 for p in Priority}
+
+    def _higher_waiting(self, priority: Priority) -> bool:
+        return any(self._waiting[p] for p in Priority if p < priority)
+
+    def _acquire(self, priority: Priority, abort=None) -> bool:
+        start = time.perf_counter()
+        acquired = True
+        with self._cond:
+            self._waiting[priority] += 1
+            # wake checkpoint() waiters: a new arrival may be what their abort() checks for
+            self._cond.notify_all()
+            try:
+                while self._running >= self.cpu_slots or self._higher_waiting(priority):
+                    if abort is not None and abort():
+                        acquired = False
+                        break
+                    self._cond.wait()
+            finally:
+                self._waiting[priority] -= 1
+            self._running += 1
+            self._wait_seconds[priority.name.lower()] += time.perf_counter() - start
+        return acquired
+
+    def _release(self) -> None:
+        with self._cond:
+            self._running -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority: Priority):
+        """Hold a CPU slot for the duration of the block (uploads pass straight through)."""
+        if priority == Priority.UPLOAD:
+            try:
+                yield
+            finally:
+                with self._cond:
+                    self._completed["upload"] += 1
+            return
+        self._acquire(priority)
+        try:
+            yield
+        finally:
+            self._release()
+            with self._cond:
+                self._completed[priority.name.lower()] += 1
+
+    def run(self, priority: Priority, fn, *args, **kwargs):
+        """Run fn in the calling thread once a slot of this priority is available."""
+        with self.slot(priority):
+            return fn(*args, **kwargs)
+
+    def checkpoint(self, priority: Priority, abort=None) -> bool:
+        """
+        Call between decode steps of a background job holding a slot. If higher-priority
+        work is queued, give the slot up until that work has started, then take it back.
+        abort() is checked while waiting to take it back: once it is true the job keeps
+        its slot without waiting (briefly over the limit) and False is returned, so a job
+        holding a lock the waiter needs can stop and release both.
+        """
+        with self._cond:
+            if not self._higher_waiting(priority):
+                return True
+            self._preemptions[priority.name.lower()] += 1
+            self._running -= 1
+            self._cond.notify_all()
+        return self._acquire(priority, abort)
+
+    def record_preemption(self, priority: Priority) -> None:
+        """Count a preemption by a job that stops and restarts instead of calling checkpoint()."""
+        with self._cond:
+            self._preemptions[priority.name.lower()] += 1
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {
+                "cpu_slots": self.cpu_slots,
+                "running": self._running,
+                "waiting": {p.name.lower(): n for p, n in self._waiting.items()},
+                "completed": dict(self._completed),
+                "preemptions": dict(self._preemptions),
+                "wait_seconds": {k: round(v, 3) for k, v in self._wait_seconds.items()},
+            }
+
+
+# Process-wide scheduler used by the server, interview engine and evaluators
+scheduler = JobScheduler()
@@ -0,0 +1,131 @@
+"""
+Resume distillation: turn parsed resume text into a compact structured profile once,
+cached by content hash, so the interviewer prompt carries a few hundred tokens instead
+of the full resume layout on every turn.
+"""
+import hashlib
+import json
+from pathlib import Path
+from typing import Optional
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+PROFILES_DIR = _SCRIPT_DIR / "resume_profiles"
+
+PROFILE_MAX_TOKENS = 600
+# Raw text fed to the extractor is capped; resumes past this are almost always noise
+MAX_INPUT_CHARS = 12000
+
+_EXTRACT_PROMPT = """You extract structured data from resumes.
+Return ONLY a JSON object with exactly these keys:
+{
+  "headline": "<current title or one-line summary>",
+  "skills": ["<skill>", ...],
+  "roles": [{"title": "<title>", "company": "<company>", "start": "<date>", "end": "<date or present>"}],
+  "projects": [{"name": "<name>", "tech": ["<tech>"], "summary": "<one sentence>"}],
+  "education": ["<degree, institution, year>"]
+}
+Use only facts present in the resume. Keep every string short. Use [] when a section is missing."""
+
+
+def content_hash(text: str) -> str:
+    """Stable hash of resume text (whitespace-normalised) used as the cache key."""
+    normalized = " ".join(text.split())
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()
+
+
+def _profile_path(digest: str) -> Path:
+    return PROFILES_DIR / f"{digest}.json"
+
+
+def load_profile_for(resume_text: str) -> Optional[dict]:
+    """Return the cached profile for this resume text, or None if not distilled yet."""
+    if not resume_text.strip():
+        return None
+    path = _profile_path(content_hash(resume_text))
+    if not path.exists():
+        return None
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return None
+
+
+def distill_resume(resume_text: str) -> dict:
+    """
+    Extract (or load from cache) the structured profile for resume_text.
+    Runs one LLM call per distinct resume; repeat calls are a file read.
+    """
+    cached = load_profile_for(resume_text)
+    if cached is not None:
+        return cached
+
+    # imported lazily: interview_engine itself imports this module
+    from interview_engine import chat_completion
+
+    raw = chat_completion(
+        [
+            {"role": "system", "content": _EXTRACT_PROMPT},
+            {"role": "user", "content": resume_text[:MAX_INPUT_CHARS]},
+        ],
+        max_tokens=PROFILE_MAX_TOKENS,
+        temperature=0.0,
+        response_format={"type": "json_object"},
+    )
+    data = json.loads(raw)
+    profile = {
+        "headline": str(data.get("headline", "")).strip(),
+        "skills": [str(s).strip() for s in data.get("skills", []) if str(s).strip()],
+        "roles": [r for r in data.get("roles", []) if isinstance(r, dict)],
+        "projects": [p for p in data.get("projects", []) if isinstance(p, dict)],
+        "education": [str(e).strip() for e in data.get("education", []) if str(e).strip()],
+    }
+
+    PROFILES_DIR.mkdir(exist_ok=True)
+    _profile_path(content_hash(resume_text)).write_text(
+        json.dumps(profile, indent=2), encoding="utf-8"
+    )
+    return profile
+
+
+def format_profile(profile: dict) -> str:
+    """Render a profile as the compact text block used in the interviewer prompt."""
+    lines = []
+    if profile.get("headline"):
+        lines.append(f"Headline: {profile['headline']}")
+    if profile.get("skills"):
+        lines.append("Skills: " + ", ".join(profile["skills"]))
+    if profile.get("roles"):
+        lines.append("Roles:")
+        for r in profile["roles"]:
+            dates = "–".join(d for d in (r.get("start", ""), r.get("end", "")) if d)
+            at = f" @ {r['company']}" if r.get("company") else ""
+            lines.append(f"- {r.get('title', '')}{at}" + (f" ({dates})" if dates else ""))
+    if profile.get("projects"):
+        lines.append("Projects:")
+        for p in profile["projects"]:
+            tech = f" [{', '.join(p['tech'])}]" if p.get("tech") else ""
+            summary = f": {p['summary']}" if p.get("summary") else ""
+            lines.append(f"- {p.get('name', '')}{tech}{summary}")
+    if profile.get("education"):
+        lines.append("Education: " + "; ".join(profile["education"]))
+    return "\n".join(lines)
+
+
+def distill_resume_file(resume_md_path: str) -> Optional[dict]:
+    """Distill the resume saved by resume_parser.parse_and_save (no-op if empty)."""
+    path = Path(resume_md_path)
+    if not path.exists():
+        return None
+    text = path.read_text(encoding="utf-8")
+    if not text.strip():
+        return None
+    return distill_resume(text)
+
+
+if __name__ == "__main__":
+    import sys
+    src = sys.argv[1] if len(sys.argv) > 1 else str(_SCRIPT_DIR / "resume_text.md")
+    result = distill_resume_file(src)
+    if result is None:
+        raise SystemExit(f"❌ No resume text at {src}")
+    print(format_profile(result))
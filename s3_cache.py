@@ -0,0 +1,41 @@
+"""
+Local on-disk copy of S3 objects in s3_cache/, validated by ETag. S3Handler sends the
+cached ETag as If-None-Match, so an unchanged object costs a 304 instead of a download.
+The index keeps each object's ETag; least recently used objects are evicted once
+S3_CACHE_MAX_BYTES is exceeded (see disk_lru).
+"""
+import hashlib
+import os
+from pathlib import Path
+
+from disk_lru import DiskLRU
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+CACHE_DIR = _SCRIPT_DIR / "s3_cache"
+MAX_BYTES = int(os.getenv("S3_CACHE_MAX_BYTES", str(100 * 1024 * 1024)))
+
+
+class S3ObjectCache(DiskLRU):
+    def __init__(self, cache_dir: Path = CACHE_DIR, max_bytes: int = MAX_BYTES):
+        super().__init__(cache_dir, max_bytes)
+
+    def _file_name(self, cache_key: str, ext: str) -> str:
+        # "bucket/key" is not a safe file name
+        return hashlib.sha256(cache_key.encode("utf-8")).hexdigest()
+
+    def _key_for_file(self, path: Path):
+        return None  # hashed names can't be mapped back to a key
+
+    def etag(self, cache_key: str):
+        """ETag of the cached copy, or None."""
+        meta = self.meta(cache_key)
+        return meta.get("etag") if meta else None
+
+    def get(self, cache_key: str):
+        """Cached bytes (marks them recently used), or None."""
+        return self.read(cache_key)
+
+    def put(self, cache_key: str, etag: str, data: bytes) -> None:
+        if not etag or len(data) > self.max_bytes:
+            return
+        self.write(cache_key, data, meta={"etag": etag})
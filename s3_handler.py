@@ -1,10 +1,19 @@
+import io
+import json
 import os
+import threading
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import ClientError, NoCredentialsError
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import BinaryIO, Iterator, Optional, Union
+
+from s3_cache import S3ObjectCache
+from storage_codecs import compress_json, content_encoding, decompress, encode_recording, load_json
 
 # Load environment variables
 load_dotenv()
@@ -14,6 +23,78 @@ AWS_ACCESS_KEY_ID = os.getenv("AWS_ACCESS_KEY_ID")
 AWS_SECRET_ACCESS_KEY = os.getenv("AWS_SECRET_ACCESS_KEY")
 AWS_REGION = os.getenv("AWS_REGION", "us-east-1")
 S3_BUCKET_NAME = os.getenv("S3_BUCKET_NAME")
+# Optional S3-compatible endpoint (MinIO, moto server) for local testing
+AWS_ENDPOINT_URL = os.getenv("AWS_ENDPOINT_URL") or None
+# botocore >= 1.36 adds CRC checksums to every request and validates them on responses,
+# which many S3 stand-ins (older MinIO, localstack) reject; against a custom endpoint
+# checksums are only sent where the API requires them
+CHECKSUM_CONFIG = (
+    {"request_checksum_calculation": "when_required", "response_checksum_validation": "when_required"}
+    if AWS_ENDPOINT_URL else {}
+)
+
+# Parallel GETs share the client's connection pool, so size the pool to the fetch workers
+S3_FETCH_WORKERS = 16
+S3_MAX_POOL_CONNECTIONS = 32
+
+# Recordings above the threshold go up as parallel multipart chunks
+TRANSFER_CONFIG = TransferConfig(
+    multipart_threshold=8 * 1024 * 1024,
+    multipart_chunksize=8 * 1024 * 1024,
+    max_concurrency=8,
+    use_threads=True,
+)
+
+# Per-user index of interviews (bucketname/username/manifest.json), so the dashboard
+# loads with one GET; full logs/evaluations are only fetched when needed
+MANIFEST_NAME = "manifest.json"
+MANIFEST_VERSION = 1
+MANIFEST_WRITE_ATTEMPTS = 3
+PREVIEW_QUESTION_CHARS = 55
+PREVIEW_ANSWER_CHARS = 100
+
+
+def _iso(value) -> Optional[str]:
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def _preview(text: str, max_chars: int) -> str:
+    """text cut to max_chars, marked with an ellipsis when something was cut."""
+    text = (text or "").strip()
+    if len(text) <= max_chars:
+        return text
+    return text[:max_chars].rstrip() + " …"
+
+
+def manifest_entry_from_log(log_data: dict, s3_key: str, last_modified=None) -> dict:
+    """Manifest fields taken from an interview log (metadata + a short Q/A preview)."""
+    meta = log_data.get("metadata") or {}
+    return {
+        "role": meta.get("role"),
+        "difficulty": meta.get("difficulty"),
+        "started_at": meta.get("started_at"),
+        "ended_at": meta.get("ended_at"),
+        "question_count": len(log_data.get("qa_pairs") or []),
+        "qa_preview": [
+            {"question": _preview(p.get("question"), PREVIEW_QUESTION_CHARS),
+             "answer": _preview(p.get("answer"), PREVIEW_ANSWER_CHARS)}
+            for p in log_data.get("qa_pairs") or []
+        ],
+        "log_key": s3_key,
+        "log_last_modified": _iso(last_modified) or datetime.now().isoformat(),
+    }
+
+
+def manifest_entry_from_evaluation(eval_data: dict, s3_key: str, last_modified=None) -> dict:
+    """Manifest fields taken from an evaluation (scores, verdict, candidate feedback)."""
+    return {
+        "overall_scores": eval_data.get("overall_scores"),
+        "hire_signal": eval_data.get("hire_signal"),
+        "confidence_level": eval_data.get("confidence_level"),
+        "final_feedback_for_candidate": eval_data.get("final_feedback_for_candidate"),
+        "evaluation_key": s3_key,
+        "evaluation_last_modified": _iso(last_modified) or datetime.now().isoformat(),
+    }
 
 
 class S3Handler:
@@ -28,9 +109,18 @@ class S3Handler:
                 's3',
                 aws_access_key_id=AWS_ACCESS_KEY_ID,
                 aws_secret_access_key=AWS_SECRET_ACCESS_KEY,
-                region_name=AWS_REGION
+                region_name=AWS_REGION,
+                endpoint_url=AWS_ENDPOINT_URL,
+                config=Config(
+                    max_pool_connections=S3_MAX_POOL_CONNECTIONS,
+                    retries={'max_attempts': 5, 'mode': 'adaptive'},
+                    **CHECKSUM_CONFIG,
+                ),
             )
             self.bucket_name = S3_BUCKET_NAME
+            self._manifest_lock = threading.Lock()
+            self._warned_unconditional = False
+            self.object_cache = S3ObjectCache()
             print(f"✅ S3 Handler initialized for bucket: {self.bucket_name}")
         except Exception as e:
             print(f"❌ Failed to initialize S3 client: {e}")
@@ -49,6 +139,9 @@ class S3Handler:
 
     def upload_audio_recording(self, local_file_path: str, username: str) -> dict:
         """Upload recording to username/recordings/interview_YYYYMMDD_HHMMSS.ext"""
+        if Path(local_file_path).suffix.lower() == ".wav" and os.path.exists(local_file_path):
+            # raw PCM WAV is re-encoded (FLAC/Opus) before upload
+            return self.upload_audio_recording_bytes(Path(local_file_path).read_bytes(), username)
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         ext = Path(local_file_path).suffix
         custom_filename = f"interview_{timestamp}{ext}"
@@ -59,6 +152,14 @@ class S3Handler:
             folder="recordings"
         )
 
+    def upload_audio_recording_bytes(self, data: Union[bytes, BinaryIO], username: str,
+                                     ext: str = ".wav") -> dict:
+        """Upload an in-memory recording to username/recordings/interview_YYYYMMDD_HHMMSS.ext"""
+        if ext.lower() == ".wav":
+            data, ext = encode_recording(data if isinstance(data, (bytes, bytearray)) else data.read())
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return self.upload_stream(data, username, f"interview_{timestamp}{ext}", folder="recordings")
+
     def upload_document(self, local_file_path: str, username: str, doc_type: str, timestamp: int) -> dict:
         """Upload document to username/documents/{doc_type}_{timestamp}.ext"""
         if not self.s3_client:
@@ -70,6 +171,45 @@ class S3Handler:
         s3_key = f"{username}/documents/{s3_filename}"
         return self._upload_to_key(local_file_path, s3_key, s3_filename)
 
+    def upload_document_bytes(self, data: Union[bytes, BinaryIO], username: str, doc_type: str,
+                              timestamp: int, ext: str) -> dict:
+        """Upload in-memory document content to username/documents/{doc_type}_{timestamp}.ext"""
+        return self.upload_stream(data, username, f"{doc_type}_{timestamp}{ext}", folder="documents")
+
+    def upload_stream(self, data: Union[bytes, BinaryIO], username: str, filename: str,
+                      folder: str = "recordings") -> dict:
+        """Upload bytes or a file-like object to bucketname/username/{folder}/{filename}."""
+        if not self.s3_client:
+            return {'success': False, 'message': 'S3 client not initialized', 'url': None, 'key': None}
+        fileobj = io.BytesIO(data) if isinstance(data, (bytes, bytearray)) else data
+        return self.upload_fileobj(fileobj, f"{username}/{folder}/{filename}", filename)
+
+    def upload_fileobj(self, fileobj: BinaryIO, s3_key: str, filename: str = None) -> dict:
+        """Upload a readable binary file object to s3_key (multipart per TRANSFER_CONFIG)."""
+        filename = filename or os.path.basename(s3_key)
+        try:
+            head = b""
+            if fileobj.seekable():
+                head = fileobj.read(4)
+                fileobj.seek(0)
+            self.s3_client.upload_fileobj(
+                fileobj,
+                self.bucket_name,
+                s3_key,
+                ExtraArgs=self._upload_args(filename, head),
+                Config=TRANSFER_CONFIG,
+            )
+            print(f"✅ Uploaded: {filename} -> {s3_key}")
+            return self._upload_result(s3_key, filename)
+        except NoCredentialsError:
+            return {'success': False, 'message': 'AWS credentials not found', 'url': None, 'key': None}
+        except Exception as e:
+            return {'success': False, 'message': str(e), 'url': None, 'key': None}
+
+    def _upload_result(self, s3_key: str, filename: str) -> dict:
+        file_url = f"https://{self.bucket_name}.s3.{AWS_REGION}.amazonaws.com/{s3_key}"
+        return {'success': True, 'message': 'Upload successful', 'url': file_url, 'key': s3_key, 'filename': filename}
+
     def upload_log_file(self, local_file_path: str, username: str, session_id: str) -> dict:
         """Upload interview log to username/logfile/interview_log_{session_id}.json"""
         if not self.s3_client:
@@ -78,7 +218,10 @@ class S3Handler:
             return {'success': False, 'message': f'File not found: {local_file_path}', 'url': None, 'key': None}
         s3_filename = f"interview_log_{session_id}.json"
         s3_key = f"{username}/logfile/{s3_filename}"
-        return self._upload_to_key(local_file_path, s3_key, s3_filename)
+        result = self._upload_json_file(local_file_path, s3_key, s3_filename)
+        if result['success']:
+            self._record_in_manifest(username, session_id, local_file_path, s3_key, manifest_entry_from_log)
+        return result
 
     def upload_evaluation_file(self, local_file_path: str, username: str, session_id: str) -> dict:
         """Upload evaluation JSON to username/evaluations/interview_log_{session_id}.evaluation.json"""
@@ -88,20 +231,118 @@ class S3Handler:
             return {'success': False, 'message': f'File not found: {local_file_path}', 'url': None, 'key': None}
         s3_filename = f"interview_log_{session_id}.evaluation.json"
         s3_key = f"{username}/evaluations/{s3_filename}"
-        return self._upload_to_key(local_file_path, s3_key, s3_filename)
+        result = self._upload_json_file(local_file_path, s3_key, s3_filename)
+        if result['success']:
+            self._record_in_manifest(username, session_id, local_file_path, s3_key,
+                                     manifest_entry_from_evaluation)
+        return result
+
+    def _upload_json_file(self, local_file_path: str, s3_key: str, filename: str) -> dict:
+        """Upload a JSON file as compact, compressed JSON (Content-Encoding set to match)."""
+        try:
+            with open(local_file_path, "r", encoding="utf-8") as f:
+                body = compress_json(json.load(f))
+        except (OSError, json.JSONDecodeError) as e:
+            return {'success': False, 'message': str(e), 'url': None, 'key': None}
+        return self.upload_fileobj(io.BytesIO(body), s3_key, filename)
+
+    def _record_in_manifest(self, username: str, session_id: str, local_file_path: str,
+                            s3_key: str, entry_fn) -> None:
+        """After a successful upload, add the file's summary to the user's manifest."""
+        try:
+            with open(local_file_path, "r", encoding="utf-8") as f:
+                fields = entry_fn(json.load(f), s3_key)
+            if not self.update_manifest(username, {session_id: fields}):
+                print(f"⚠️ Manifest not updated for {session_id}")
+        except Exception as e:
+            print(f"⚠️ Manifest update failed for {session_id}: {e}")
+
+    def manifest_key(self, username: str) -> str:
+        return f"{username}/{MANIFEST_NAME}"
+
+    def _read_manifest(self, username: str):
+        """(manifest dict or None if absent, ETag or None)."""
+        try:
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=self.manifest_key(username))
+        except ClientError as e:
+            if e.response.get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+                return None, None
+            raise
+        return load_json(response["Body"].read()), response.get("ETag")
+
+    def get_manifest(self, username: str) -> Optional[dict]:
+        """The user's manifest ({"version", "sessions": {session_id: {...}}}), or None."""
+        if not self.s3_client:
+            return None
+        try:
+            return self._read_manifest(username)[0]
+        except Exception as e:
+            print(f"❌ Error reading manifest for {username}: {e}")
+            return None
+
+    def _supports_conditional_put(self) -> bool:
+        # If-Match / If-None-Match on PutObject need botocore >= 1.36 (see requirements.txt)
+        members = self.s3_client.meta.service_model.operation_model('PutObject').input_shape.members
+        supported = 'IfMatch' in members and 'IfNoneMatch' in members
+        if not supported and not self._warned_unconditional:
+            self._warned_unconditional = True
+            print("⚠️ botocore has no conditional PutObject: manifest updates are not atomic "
+                  "across machines (concurrent writers can drop sessions; upgrade botocore)")
+        return supported
+
+    def update_manifest(self, username: str, updates: dict, backfilled: bool = None) -> bool:
+        """
+        Merge {session_id: fields} into the user's manifest with a read-modify-write.
+        The write is conditional on the ETag that was read, so a concurrent writer causes
+        a retry instead of a lost update. With an older botocore the write is unconditional
+        (last writer wins across machines; writers in this process still serialize on
+        _manifest_lock) and a warning is logged once.
+        """
+        if not self.s3_client:
+            return False
+        with self._manifest_lock:
+            for _ in range(MANIFEST_WRITE_ATTEMPTS):
+                manifest, etag = self._read_manifest(username)
+                manifest = manifest or {"version": MANIFEST_VERSION, "sessions": {}}
+                for session_id, fields in updates.items():
+                    entry = manifest["sessions"].setdefault(session_id, {"session_id": session_id})
+                    entry.update(fields)
+                    entry["updated_at"] = datetime.now().isoformat()
+                if backfilled is not None:
+                    manifest["backfilled"] = backfilled
+                kwargs = {}
+                if self._supports_conditional_put():
+                    kwargs = {'IfMatch': etag} if etag else {'IfNoneMatch': '*'}
+                body = compress_json(manifest)
+                try:
+                    self.s3_client.put_object(
+                        Bucket=self.bucket_name,
+                        Key=self.manifest_key(username),
+                        Body=body,
+                        **self._upload_args(MANIFEST_NAME, body[:4]),
+                        **kwargs,
+                    )
+                    return True
+                except ClientError as e:
+                    if e.response.get('Error', {}).get('Code') in ('PreconditionFailed', 'ConditionalRequestConflict'):
+                        continue
+                    print(f"❌ Error writing manifest for {username}: {e}")
+                    return False
+        return False
 
     def _upload_to_key(self, local_file_path: str, s3_key: str, filename: str = None) -> dict:
         try:
-            content_type = self._get_content_type(local_file_path)
+            with open(local_file_path, "rb") as f:
+                head = f.read(4)
             self.s3_client.upload_file(
                 local_file_path,
                 self.bucket_name,
                 s3_key,
-                ExtraArgs={'ContentType': content_type}
+                ExtraArgs=self._upload_args(filename or local_file_path, head),
+                Config=TRANSFER_CONFIG,
             )
-            file_url = f"https://{self.bucket_name}.s3.{AWS_REGION}.amazonaws.com/{s3_key}"
             print(f"✅ Uploaded: {filename or os.path.basename(local_file_path)} -> {s3_key}")
-            return {'success': True, 'message': 'Upload successful', 'url': file_url, 'key': s3_key, 'filename': filename or os.path.basename(s3_key)}
+            return self._upload_result(s3_key, filename or os.path.basename(s3_key))
         except NoCredentialsError:
             return {'success': False, 'message': 'AWS credentials not found', 'url': None, 'key': None}
         except ClientError as e:
@@ -109,22 +350,23 @@ class S3Handler:
         except Exception as e:
             return {'success': False, 'message': str(e), 'url': None, 'key': None}
 
+    def iter_user_files(self, username: str, folder: str = None) -> Iterator[dict]:
+        """Yield every object under bucketname/username/[folder/], following continuation tokens."""
+        if not self.s3_client:
+            return
+        prefix = f"{username}/{folder}/" if folder else f"{username}/"
+        paginator = self.s3_client.get_paginator('list_objects_v2')
+        for page in paginator.paginate(Bucket=self.bucket_name, Prefix=prefix):
+            for obj in page.get('Contents', []):
+                yield {'key': obj['Key'], 'size': obj['Size'], 'last_modified': obj['LastModified'],
+                       'url': f"https://{self.bucket_name}.s3.{AWS_REGION}.amazonaws.com/{obj['Key']}"}
+
     def list_user_files(self, username: str, folder: str = None) -> list:
         """List keys under bucketname/username/ or bucketname/username/{folder}/."""
         if not self.s3_client:
             return []
         try:
-            prefix = f"{username}/"
-            if folder:
-                prefix = f"{username}/{folder}/"
-            response = self.s3_client.list_objects_v2(Bucket=self.bucket_name, Prefix=prefix)
-            if 'Contents' not in response:
-                return []
-            return [
-                {'key': obj['Key'], 'size': obj['Size'], 'last_modified': obj['LastModified'],
-                 'url': f"https://{self.bucket_name}.s3.{AWS_REGION}.amazonaws.com/{obj['Key']}"}
-                for obj in response['Contents']
-            ]
+            return list(self.iter_user_files(username, folder))
         except Exception as e:
             print(f"❌ Error listing files: {e}")
             return []
@@ -142,14 +384,55 @@ class S3Handler:
         """
         if not self.s3_client:
             return None
+        body = self.get_file_bytes(s3_key)
+        # gzip/zstd objects are decompressed here; get_file_bytes returns them as stored
+        return decompress(body).decode(encoding) if body is not None else None
+
+    def get_file_bytes(self, s3_key: str) -> Optional[bytes]:
+        """
+        Download a file from S3 as bytes, through the local ETag-validated cache:
+        a cached copy is revalidated with If-None-Match and reused on 304 Not Modified.
+        """
+        if not self.s3_client:
+            return None
+        cache_key = f"{self.bucket_name}/{s3_key}"
+        etag = self.object_cache.etag(cache_key)
         try:
-            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=s3_key)
+            kwargs = {'IfNoneMatch': etag} if etag else {}
+            response = self.s3_client.get_object(Bucket=self.bucket_name, Key=s3_key, **kwargs)
             body = response["Body"].read()
-            return body.decode(encoding)
+            self.object_cache.put(cache_key, response.get("ETag"), body)
+            return body
+        except ClientError as e:
+            if e.response.get('ResponseMetadata', {}).get('HTTPStatusCode') == 304:
+                cached = self.object_cache.get(cache_key)
+                if cached is not None:
+                    return cached
+                # cached copy vanished between the ETag lookup and now: fetch it again
+                self.object_cache.discard(cache_key)
+                return self.get_file_bytes(s3_key)
+            if e.response.get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+                self.object_cache.discard(cache_key)
+            print(f"❌ Error getting file {s3_key}: {e}")
+            return None
         except Exception as e:
             print(f"❌ Error getting file {s3_key}: {e}")
             return None
 
+    def get_many(self, s3_keys: list, encoding: str = "utf-8",
+                 max_workers: int = S3_FETCH_WORKERS) -> dict:
+        """
+        Download many objects in parallel on a bounded thread pool.
+
+        Returns:
+            {s3_key: content string or None if that download failed}
+        """
+        if not self.s3_client or not s3_keys:
+            return {key: None for key in s3_keys}
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(s3_keys))) as pool:
+            contents = pool.map(lambda key: self.get_file_content(key, encoding), s3_keys)
+            return dict(zip(s3_keys, contents))
+
     def delete_file(self, s3_key: str) -> bool:
         """
         Delete a file from S3
@@ -169,6 +452,7 @@ class S3Handler:
                 Bucket=self.bucket_name,
                 Key=s3_key
             )
+            self.object_cache.discard(f"{self.bucket_name}/{s3_key}")
             print(f"✅ Deleted: {s3_key}")
             return True
         
@@ -225,6 +509,8 @@ class S3Handler:
             '.mp4': 'video/mp4',
             '.m4a': 'audio/mp4',
             '.ogg': 'audio/ogg',
+            '.opus': 'audio/ogg',
+            '.flac': 'audio/flac',
             '.pdf': 'application/pdf',
             '.docx': 'application/vnd.openxmlformats-officedocument.wordprocessingml.document',
             '.txt': 'text/plain',
@@ -232,10 +518,24 @@ class S3Handler:
             '.png': 'image/png',
             '.jpg': 'image/jpeg',
             '.jpeg': 'image/jpeg',
+            '.gz': 'application/gzip',
+            '.zst': 'application/zstd',
         }
         
         return content_types.get(extension, 'application/octet-stream')
 
+    @staticmethod
+    def _upload_args(file_path: str, head: bytes) -> dict:
+        """
+        ContentType from the file name, plus Content-Encoding when the body is gzip/zstd
+        compressed JSON (stored under its .json key).
+        """
+        args = {'ContentType': S3Handler._get_content_type(file_path)}
+        encoding = content_encoding(head)
+        if encoding and args['ContentType'] == 'application/json':
+            args['ContentEncoding'] = encoding
+        return args
+
 
 # Example usage and testing
 if __name__ == "__main__":
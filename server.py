@@ -447,6 +447,7 @@
 #         print("WebSocket server stopped")
 import asyncio
 import base64
+import io
 import json
 import os
 import re
@@ -457,10 +458,15 @@ import websockets
 from datetime import datetime
 from pathlib import Path
 
-from s3_handler import S3Handler
-from start_evaluation import run_evaluation, EVALUATIONS_DIR
+from storage import get_storage
+from start_evaluation import run_evaluation, release_model_if_idle, EVALUATIONS_DIR
+from incremental_evaluation import IncrementalEvaluator
+from eval_queue import EvaluationQueue, EvaluationWorker
+from job_scheduler import Priority, scheduler
 from ssl_generator import get_ssl_context
-from resume_parser import parse_and_save
+from resume_parser import parse_and_save, parse_document
+from resume_profile import distill_resume_file
+import context_index
 from interview_engine import (
     create_interview_session,
     get_opening,
@@ -468,6 +474,7 @@ from interview_engine import (
     generate_question,
     add_response_and_generate,
     record_qa,
+    start_interview_plan,
 )
 
 # Import streaming ASR helpers from whisper_stt
@@ -482,6 +489,9 @@ from text_to_speech import (
     synthesize_opening_mp3,
     synthesize_question_mp3,
     synthesize_closing_mp3,
+    negotiate_format,
+    detect_audio_format,
+    warm_up as warm_up_tts,
 )
 
 
@@ -494,30 +504,40 @@ def get_free_port():
     return port
 
 
-async def _run_evaluation_and_send(websocket, local_log_path: str, server=None):
-    """Run evaluation, send result to client, and upload evaluation JSON to S3."""
-    loop = asyncio.get_event_loop()
+def _distill_resume_quietly(resume_md: str):
+    """Build the cached resume profile; failures only mean the raw text is used."""
     try:
-        result = await loop.run_in_executor(None, lambda: run_evaluation(Path(local_log_path)))
-        payload = {"type": "evaluation_result", "success": True, "result": result}
-        # Upload evaluation to S3 so dashboard Summary can fetch it
-        if server and getattr(server, "current_username", None) and getattr(server, "s3_handler", None) and server.s3_handler.s3_client:
-            stem = Path(local_log_path).stem  # e.g. interview_log_20260207_082736
-            session_id = stem.replace("interview_log_", "", 1) if stem.startswith("interview_log_") else stem
-            eval_path = EVALUATIONS_DIR / f"{stem}.evaluation.json"
-            if eval_path.exists():
-                up = server.s3_handler.upload_evaluation_file(str(eval_path), server.current_username, session_id)
-                if up.get("success"):
-                    print(f"☁️ Evaluation uploaded to S3: {up.get('key', '')}")
-                else:
-                    print(f"❌ S3 evaluation upload failed: {up.get('message', '')}")
+        if distill_resume_file(resume_md):
+            print("✅ Resume profile distilled")
     except Exception as e:
-        print(f"❌ Evaluation failed: {e}")
-        payload = {"type": "evaluation_result", "success": False, "error": str(e)}
+        print(f"Resume distill error: {e}")
+
+
+def _index_document_quietly(local_path: str, doc_type: str):
+    """Add an uploaded resume/JD to the retrieval index; failures leave the index as is."""
     try:
-        await websocket.send(json.dumps(payload))
-    except Exception:
-        pass
+        source = "resume" if doc_type == "resume" else "jd"
+        n = context_index.index_document(parse_document(local_path), source)
+        print(f"✅ Indexed {n} {source} chunks for retrieval")
+    except Exception as e:
+        print(f"Document index error: {e}")
+
+
+def _warm_retrieval_quietly():
+    """Load the retrieval embedder before the first live turn needs it."""
+    try:
+        if context_index.warm():
+            print("✅ Retrieval embedder warm")
+    except Exception as e:
+        print(f"Retrieval warm-up error: {e}")
+
+
+async def _run_upload(upload_fn, *args, **kwargs):
+    """Run a blocking storage write off the event loop in the scheduler's upload class."""
+    loop = asyncio.get_event_loop()
+    return await loop.run_in_executor(
+        None, lambda: scheduler.run(Priority.UPLOAD, upload_fn, *args, **kwargs)
+    )
 
 
 class WebSocketServer:
@@ -541,53 +561,144 @@ class WebSocketServer:
         self.transcribe_lock = asyncio.Lock()
 
         self.current_username = None
-        self.s3_handler = S3Handler()
+        self.storage = get_storage()
         self.interview_sessions = {}
 
+        # durable evaluation queue; in-memory incremental evaluators keyed by session id
+        self.eval_queue = EvaluationQueue()
+        self.eval_worker = None
+        self.evaluators = {}
+        self.loop = None
+
     def set_current_user(self, username: str):
-        """Set the username for S3 uploads and logs."""
+        """Set the username for stored recordings and logs."""
         self.current_username = username
         print(f"📂 Current user set to: {username}")
 
     async def save_audio(self):
-        """Save the entire audio buffer as a WAV file and upload to S3 if configured."""
+        """Save the entire audio buffer in storage (mirrored to S3 if configured)."""
         if not self.audio_buffer:
             print("No audio to save")
             return None
 
-        os.makedirs("recordings", exist_ok=True)
-        timestamp = int(time.time())
-        filename = f"interview_{timestamp}.wav"
-        local_path = f"recordings/{filename}"
-
-        with wave.open(local_path, "wb") as wf:
+        # build the WAV once in memory; storage encodes it (FLAC/Opus) straight from
+        # these bytes and the replicator streams that copy to S3 in the background
+        wav_buffer = io.BytesIO()
+        with wave.open(wav_buffer, "wb") as wf:
             wf.setnchannels(1)
             wf.setsampwidth(2)
             wf.setframerate(16000)
             wf.writeframes(self.audio_buffer)
-
-        print(f"✅ Audio saved locally: {local_path}")
-
-        if self.current_username and self.s3_handler.s3_client:
-            result = self.s3_handler.upload_audio_recording(
-                local_file_path=local_path,
-                username=self.current_username
+        wav_bytes = wav_buffer.getvalue()
+
+        if self.current_username:
+            result = await _run_upload(
+                self.storage.upload_audio_recording_bytes,
+                wav_bytes,
+                username=self.current_username,
+                ext=".wav",
             )
 
             if result["success"]:
-                print(f"☁️ Audio uploaded to S3: {result['url']}")
+                print(f"💾 Audio stored: {result['key']}")
                 return {
-                    "local_path": local_path,
+                    "local_path": result["local_path"],
                     "s3_url": result["url"],
                     "s3_key": result["key"],
                     "filename": result["filename"]
                 }
-            else:
-                print(f"❌ S3 upload failed: {result['message']}")
-                return {"local_path": local_path, "s3_url": None, "error": result["message"]}
+            print(f"❌ Audio storage failed: {result['message']}")
+            return {"local_path": self._save_raw_wav(wav_bytes), "s3_url": None, "error": result["message"]}
         else:
-            print("⚠️ No username set or S3 not configured, skipping cloud upload")
-            return {"local_path": local_path, "s3_url": None}
+            print("⚠️ No username set, skipping storage")
+            return {"local_path": self._save_raw_wav(wav_bytes), "s3_url": None}
+
+    @staticmethod
+    def _save_raw_wav(wav_bytes: bytes) -> str:
+        """Keep the WAV in recordings/ when it could not be stored for a user."""
+        os.makedirs("recordings", exist_ok=True)
+        local_path = f"recordings/interview_{int(time.time())}.wav"
+        with open(local_path, "wb") as f:
+            f.write(wav_bytes)
+        print(f"✅ Audio saved locally: {local_path}")
+        return local_path
+
+    def _run_evaluation_job(self, job: dict) -> dict:
+        """Worker thread: evaluate one queued log and store the result."""
+        log_path = Path(job["log_path"])
+        # the live session's per-answer scores only need aggregating; after a restart
+        # (no evaluator in memory) fall back to a full evaluation of the log
+        evaluator = self.evaluators.pop(job["job_key"], None)
+        on_partial = self._partial_sender(job)
+        if evaluator:
+            result = evaluator.finalize(log_path, on_partial=on_partial)
+        else:
+            result = run_evaluation(log_path, on_partial=on_partial)
+
+        username = job.get("username")
+        eval_path = EVALUATIONS_DIR / f"{log_path.stem}.evaluation.json"
+        if username and eval_path.exists():
+            up = scheduler.run(
+                Priority.UPLOAD, self.storage.upload_evaluation_file,
+                str(eval_path), username, job["job_key"],
+            )
+            if up.get("success"):
+                print(f"💾 Evaluation stored: {up.get('key', '')}")
+            else:
+                print(f"❌ Evaluation storage failed: {up.get('message', '')}")
+        return result
+
+    def _partial_sender(self, job: dict):
+        """Worker thread callback forwarding each finished evaluation field to the phone."""
+        def on_partial(field: str, value):
+            if self.loop is None or not self.clients:
+                return
+            if job.get("username") and job["username"] != self.current_username:
+                return
+            payload = {"type": "evaluation_partial", "session_id": job["job_key"],
+                       "field": field, "value": value}
+            asyncio.run_coroutine_threadsafe(self._broadcast(payload), self.loop)
+        return on_partial
+
+    async def _broadcast(self, payload: dict):
+        """Best-effort send to every connected client (progress only, not persisted)."""
+        message = json.dumps(payload)
+        for ws in list(self.clients):
+            try:
+                await ws.send(message)
+            except Exception:
+                pass
+
+    def _on_evaluation_finished(self, job: dict, result, error):
+        """Worker thread: push finished evaluations to the connected owner."""
+        if self.loop is not None and self.clients:
+            asyncio.run_coroutine_threadsafe(self._push_evaluations(), self.loop)
+
+    @staticmethod
+    def _evaluation_payload(job: dict) -> dict:
+        if job["status"] == "done":
+            return {"type": "evaluation_result", "success": True,
+                    "session_id": job["job_key"], "result": json.loads(job["result"])}
+        return {"type": "evaluation_result", "success": False,
+                "session_id": job["job_key"], "error": job["error"]}
+
+    def _owns_evaluation(self, job: dict) -> bool:
+        # recovered jobs have no owner; only the session id the client asked for reaches it
+        return job.get("username") is None or job["username"] == self.current_username
+
+    async def _push_evaluations(self):
+        """
+        Send the current user's unacknowledged results to connected clients. They stay
+        undelivered until the analysis screen showing that session sends evaluation_ack.
+        """
+        targets = list(self.clients)
+        for job in self.eval_queue.undelivered(self.current_username):
+            message = json.dumps(self._evaluation_payload(job))
+            for ws in targets:
+                try:
+                    await ws.send(message)
+                except Exception:
+                    pass
 
     async def handler(self, websocket, path=None):
         """Handle an individual WebSocket connection."""
@@ -627,7 +738,7 @@ class WebSocketServer:
                             loop = asyncio.get_event_loop()
                             # run Whisper ASR in executor to avoid blocking the event loop
                             text = await loop.run_in_executor(
-                                None, lambda cb=chunk: transcribe_pcm16_chunk(cb)
+                                None, lambda cb=chunk: scheduler.run(Priority.ASR, transcribe_pcm16_chunk, cb)
                             )
                             if text:
                                 print(f"📝 Converted text: {text!r}")
@@ -673,7 +784,10 @@ class WebSocketServer:
 
                             def do_transcribe_and_next():
                                 # transcribe any leftover audio
-                                remainder_text = transcribe_pcm16_chunk(remainder_bytes) if remainder_bytes else ""
+                                remainder_text = (
+                                    scheduler.run(Priority.ASR, transcribe_pcm16_chunk, remainder_bytes)
+                                    if remainder_bytes else ""
+                                )
                                 if remainder_text:
                                     print(f"📝 Converted text (remainder): {remainder_text!r}")
 
@@ -692,6 +806,11 @@ class WebSocketServer:
                                 # update interview session
                                 sess = self.interview_sessions[session_key]
                                 record_qa(sess, sess["current_question"], full_text.strip())
+                                # score this answer in the background while the interview goes on
+                                if sess.get("evaluator"):
+                                    sess["evaluator"].submit(
+                                        sess["question_count"], sess["current_question"], full_text.strip()
+                                    )
                                 next_q = add_response_and_generate(sess, full_text.strip())
                                 return full_text.strip(), next_q, full_text.strip()
 
@@ -716,10 +835,14 @@ class WebSocketServer:
 
                                     # synthesize question audio
                                     try:
-                                        mp3_bytes = await loop.run_in_executor(None, lambda t=next_question: synthesize_question_mp3(t))
+                                        audio_format = self.interview_sessions[session_key].get("audio_format")
+                                        mp3_bytes = await loop.run_in_executor(
+                                            None, lambda t=next_question: synthesize_question_mp3(t, audio_format)
+                                        )
                                         await websocket.send(json.dumps({
                                             "type": "interviewer_audio",
                                             "audio_base64": base64.b64encode(mp3_bytes).decode("ascii"),
+                                            "format": detect_audio_format(mp3_bytes),
                                             "text": next_question,
                                         }))
                                         print("✅ Sent interviewer_audio for LLM question")
@@ -732,21 +855,26 @@ class WebSocketServer:
                                     await websocket.send(json.dumps({"type": "interviewer_text", "text": closing_text}))
 
                                     try:
-                                        mp3_bytes = await loop.run_in_executor(None, lambda: synthesize_closing_mp3(closing_text))
+                                        audio_format = self.interview_sessions[session_key].get("audio_format")
+                                        mp3_bytes = await loop.run_in_executor(
+                                            None, lambda: synthesize_closing_mp3(closing_text, audio_format)
+                                        )
                                         await websocket.send(json.dumps({
                                             "type": "interviewer_audio",
                                             "audio_base64": base64.b64encode(mp3_bytes).decode("ascii"),
+                                            "format": detect_audio_format(mp3_bytes),
                                             "text": closing_text,
                                         }))
                                         print("✅ Sent closing message (TTS)")
                                     except Exception as tts_ex:
                                         print(f"❌ TTS for closing failed: {tts_ex}")
 
-                                    # save conversation log to file and S3
+                                    # save conversation log to file and storage
                                     sess = self.interview_sessions.get(session_key)
                                     local_log_path = None
                                     if sess and "conversation_log" in sess:
                                         sess["conversation_log"]["metadata"]["ended_at"] = datetime.now().isoformat()
+                                        sess["conversation_log"]["metadata"]["scheduler"] = scheduler.stats()
                                         os.makedirs("logs", exist_ok=True)
                                         log_filename = f"interview_log_{sess['session_id']}.json"
                                         local_log_path = os.path.join("logs", log_filename)
@@ -754,26 +882,34 @@ class WebSocketServer:
                                             json.dump(sess["conversation_log"], f, indent=2)
                                         print(f"💾 Interview log saved locally: {local_log_path}")
 
-                                        if self.current_username and self.s3_handler.s3_client:
-                                            log_result = self.s3_handler.upload_log_file(
+                                        if self.current_username:
+                                            log_result = await _run_upload(
+                                                self.storage.upload_log_file,
                                                 local_file_path=local_log_path,
                                                 username=self.current_username,
                                                 session_id=sess["session_id"],
                                             )
                                             if log_result["success"]:
-                                                print(f"☁️ Interview log uploaded to S3: {log_result['url']}")
+                                                print(f"💾 Interview log stored: {log_result['key']}")
                                             else:
-                                                print(f"❌ S3 log upload failed: {log_result['message']}")
+                                                print(f"❌ Interview log storage failed: {log_result['message']}")
                                         else:
-                                            print("⚠️ No username or S3 config, skipping log upload")
+                                            print("⚠️ No username, skipping log storage")
 
                                     # notify client that interview is complete
-                                    await websocket.send(json.dumps({"type": "interview_complete"}))
+                                    await websocket.send(json.dumps({
+                                        "type": "interview_complete",
+                                        "session_id": sess["session_id"] if sess else None,
+                                    }))
                                     print("✅ Interview complete (max questions reached)")
 
-                                    # start evaluation in background
+                                    # queue evaluation (durable; result is pushed when ready)
                                     if local_log_path:
-                                        asyncio.create_task(_run_evaluation_and_send(websocket, local_log_path, server=self))
+                                        if sess.get("evaluator"):
+                                            self.evaluators[sess["session_id"]] = sess["evaluator"]
+                                        self.eval_queue.enqueue(
+                                            sess["session_id"], local_log_path, self.current_username
+                                        )
 
                             except Exception as ex:
                                 print(f"Interview step error: {ex}")
@@ -811,22 +947,34 @@ class WebSocketServer:
                                     resume_md = os.path.join(script_dir, "resume_text.md")
                                     parse_and_save(local_path, resume_md)
                                     print("✅ Resume parsed to resume_text.md")
+                                    # distill a compact profile in the background; interviews
+                                    # fall back to the raw text until it is ready
+                                    asyncio.get_event_loop().run_in_executor(
+                                        None, lambda p=resume_md: _distill_resume_quietly(p)
+                                    )
                                 except Exception as parse_err:
                                     print(f"Resume parse error: {parse_err}")
 
+                            # chunk + embed into the local retrieval index (resume or JD)
+                            asyncio.get_event_loop().run_in_executor(
+                                None, lambda p=local_path, d=doc_type: _index_document_quietly(p, d)
+                            )
+
                             s3_url = None
-                            if self.current_username and self.s3_handler.s3_client:
-                                s3_result = self.s3_handler.upload_document(
-                                    local_file_path=local_path,
+                            if self.current_username:
+                                s3_result = await _run_upload(
+                                    self.storage.upload_document_bytes,
+                                    content,
                                     username=self.current_username,
                                     doc_type=doc_type,
                                     timestamp=ts,
+                                    ext=ext,
                                 )
                                 if s3_result["success"]:
                                     s3_url = s3_result["url"]
-                                    print(f"☁️ Document uploaded to S3: {s3_url}")
+                                    print(f"💾 Document stored: {s3_result['key']}")
                                 else:
-                                    print(f"❌ S3 document upload failed: {s3_result['message']}")
+                                    print(f"❌ Document storage failed: {s3_result['message']}")
 
                             await websocket.send(json.dumps({
                                 "type": "document_upload_result",
@@ -846,7 +994,13 @@ class WebSocketServer:
                             difficulty = "MEDIUM"
                         try:
                             session = create_interview_session(role, difficulty)
+                            session["evaluator"] = IncrementalEvaluator(role, difficulty)
                             self.interview_sessions[session_key] = session
+                            # plan the follow-ups while the opening plays and the candidate answers
+                            start_interview_plan(session)
+                            if session.get("retrieval"):
+                                # per-turn retrieval would otherwise load the embedder in the first answer
+                                asyncio.get_event_loop().run_in_executor(None, _warm_retrieval_quietly)
 
                             opening = get_opening(role)
                             session["current_question"] = opening
@@ -854,12 +1008,19 @@ class WebSocketServer:
                             # send initial question text
                             await websocket.send(json.dumps({"type": "interviewer_text", "text": opening}))
 
-                            # synthesize audio for the opening question
+                            # synthesize audio for the opening question in the format the phone asked for
                             loop = asyncio.get_event_loop()
-                            mp3_bytes = await loop.run_in_executor(None, lambda: synthesize_opening_mp3(opening))
+                            audio_format = await loop.run_in_executor(
+                                None, negotiate_format, data.get("audio_formats")
+                            )
+                            session["audio_format"] = audio_format
+                            mp3_bytes = await loop.run_in_executor(
+                                None, lambda: synthesize_opening_mp3(opening, audio_format)
+                            )
                             await websocket.send(json.dumps({
                                 "type": "interviewer_audio",
                                 "audio_base64": base64.b64encode(mp3_bytes).decode("ascii"),
+                                "format": detect_audio_format(mp3_bytes),
                                 "text": opening,
                             }))
                         except Exception as ex:
@@ -889,6 +1050,18 @@ class WebSocketServer:
                                 "quota_exceeded": "quota" in err_str or "credits" in err_str,
                             }))
 
+                    # ---- EVALUATION RESULTS ----
+                    elif data.get("type") == "evaluation_request":
+                        # the analysis screen asks for its session's result (e.g. after a reconnect)
+                        job = self.eval_queue.get(str(data.get("session_id") or ""))
+                        if job and job["status"] in ("done", "failed") and self._owns_evaluation(job):
+                            await websocket.send(json.dumps(self._evaluation_payload(job)))
+
+                    elif data.get("type") == "evaluation_ack":
+                        job = self.eval_queue.get(str(data.get("session_id") or ""))
+                        if job and self._owns_evaluation(job):
+                            self.eval_queue.mark_delivered(job["job_key"])
+
                     # ---- END INTERVIEW ----
                     elif data.get("type") == "end_interview":
                         self.interview_sessions.pop(session_key, None)
@@ -915,6 +1088,21 @@ class WebSocketServer:
         if self.port is None:
             self.port = get_free_port()
 
+        # evaluation worker: requeue interrupted jobs and unevaluated logs, then drain
+        self.loop = asyncio.get_event_loop()
+        if self.eval_worker is None or not self.eval_worker.is_alive():
+            recovered = self.eval_queue.recover(EVALUATIONS_DIR, Path("logs"))
+            if recovered:
+                print(f"🔁 Resuming {recovered} evaluation job(s)")
+            self.eval_worker = EvaluationWorker(
+                self.eval_queue, self._run_evaluation_job, self._on_evaluation_finished,
+                on_idle=release_model_if_idle,
+            )
+            self.eval_worker.start()
+
+        # open the TTS connection now so the first question skips the TLS handshake
+        self.loop.run_in_executor(None, warm_up_tts)
+
         ssl_context = get_ssl_context()
         # configure keepalive settings to avoid ping timeouts during long transcriptions
         self.server = await websockets.serve(
@@ -4,15 +4,19 @@ import 'package:flutter/material.dart';
 import 'package:web_socket_channel/web_socket_channel.dart';
 
 /// Analysis screen shown after interview completes.
-/// Shows loader + "We are evaluating, please wait" until evaluation_result is received, then displays result.
+/// Shows loader + "We are evaluating, please wait" until the first evaluation_partial
+/// for [sessionId] arrives, fills scores and sections in as further fields stream in,
+/// then displays the final evaluation_result and acknowledges it to the server.
 class AnalysisScreen extends StatefulWidget {
   final WebSocketChannel channel;
   final Stream stream;
+  final String? sessionId;
 
   const AnalysisScreen({
     super.key,
     required this.channel,
     required this.stream,
+    this.sessionId,
   });
 
   @override
@@ -23,6 +27,8 @@ class _AnalysisScreenState extends State<AnalysisScreen>
     with SingleTickerProviderStateMixin {
   bool _isLoading = true;
   Map<String, dynamic>? _evaluation;
+  // fields streamed so far, merged into the same shape as the final result
+  final Map<String, dynamic> _partial = {};
   String? _error;
   StreamSubscription? _wsSubscription;
   late AnimationController _fadeController;
@@ -42,7 +48,12 @@ class _AnalysisScreenState extends State<AnalysisScreen>
       if (event is String && mounted) {
         try {
           final data = jsonDecode(event) as Map<String, dynamic>?;
-          if (data?['type'] == 'evaluation_result') {
+          // results of other interviews can arrive on the same connection
+          if (widget.sessionId != null && data?['session_id'] != widget.sessionId) return;
+          if (data?['type'] == 'evaluation_partial' && _isLoading) {
+            setState(() => _applyPartial(data!['field'] as String, data['value']));
+          } else if (data?['type'] == 'evaluation_result') {
+            _acknowledge();
             if (data!['success'] == true && data['result'] != null) {
               setState(() {
                 _isLoading = false;
@@ -60,6 +71,48 @@ class _AnalysisScreenState extends State<AnalysisScreen>
         } catch (_) {}
       }
     });
+    // the result may already be finished (e.g. it completed while reconnecting)
+    if (widget.sessionId != null) {
+      widget.channel.sink.add(jsonEncode({
+        'type': 'evaluation_request',
+        'session_id': widget.sessionId,
+      }));
+    }
+  }
+
+  /// Merge one streamed field: "overall_scores.communication",
+  /// "per_question_feedback[2]", "final_feedback_for_candidate.overall_summary"
+  /// or a whole top-level field such as "strengths".
+  void _applyPartial(String field, dynamic value) {
+    final indexed = RegExp(r'^(\w+)\[(\d+)\]$').firstMatch(field);
+    if (indexed != null) {
+      final key = indexed.group(1)!;
+      final index = int.parse(indexed.group(2)!);
+      final list = List<dynamic>.from((_partial[key] as List?) ?? []);
+      while (list.length <= index) {
+        list.add(null);
+      }
+      list[index] = value;
+      _partial[key] = list;
+      return;
+    }
+    final dot = field.indexOf('.');
+    if (dot > 0) {
+      final key = field.substring(0, dot);
+      final section = Map<String, dynamic>.from((_partial[key] as Map?) ?? {});
+      section[field.substring(dot + 1)] = value;
+      _partial[key] = section;
+      return;
+    }
+    _partial[field] = value;
+  }
+
+  void _acknowledge() {
+    if (widget.sessionId == null) return;
+    widget.channel.sink.add(jsonEncode({
+      'type': 'evaluation_ack',
+      'session_id': widget.sessionId,
+    }));
   }
 
   @override
@@ -71,6 +124,9 @@ class _AnalysisScreenState extends State<AnalysisScreen>
 
   @override
   Widget build(BuildContext context) {
+    if (_isLoading && _partial.isNotEmpty) {
+      return _buildResultContent(_partial, inProgress: true);
+    }
     if (_isLoading) {
       return Scaffold(
         appBar: AppBar(
@@ -135,11 +191,10 @@ class _AnalysisScreenState extends State<AnalysisScreen>
       );
     }
 
-    return _buildResultContent();
+    return _buildResultContent(_evaluation!);
   }
 
-  Widget _buildResultContent() {
-    final e = _evaluation!;
+  Widget _buildResultContent(Map<String, dynamic> e, {bool inProgress = false}) {
     final overallScores = e['overall_scores'] as Map<String, dynamic>?;
     final overallScore = overallScores != null
         ? (overallScores['overall_score'] as num?)?.toDouble()
@@ -171,6 +226,20 @@ class _AnalysisScreenState extends State<AnalysisScreen>
                 ),
               ),
             ),
+            if (inProgress) ...[
+              const SizedBox(height: 12),
+              const LinearProgressIndicator(),
+              const SizedBox(height: 8),
+              Center(
+                child: Text(
+                  _scoredAnswersText(e),
+                  style: TextStyle(
+                    fontSize: 14,
+                    color: Theme.of(context).colorScheme.onSurface.withOpacity(0.7),
+                  ),
+                ),
+              ),
+            ],
             const SizedBox(height: 24),
             _buildScoreCard(overallScore, hireSignal),
             if (summary != null && summary.isNotEmpty) ...[
@@ -237,6 +306,13 @@ class _AnalysisScreenState extends State<AnalysisScreen>
     );
   }
 
+  String _scoredAnswersText(Map<String, dynamic> e) {
+    final scored = ((e['per_question_feedback'] as List?) ?? []).where((q) => q != null).length;
+    return scored > 0
+        ? 'Still evaluating… $scored answer${scored == 1 ? '' : 's'} scored'
+        : 'Still evaluating…';
+  }
+
   List<String> _listStrings(dynamic value) {
     if (value == null) return [];
     if (value is List) {
@@ -30,6 +30,7 @@ class _InterviewScreenState extends State<InterviewScreen> {
   String finalTranscript = "";
   String interviewerTranscript = "";
   bool _navigateToAnalysisWhenDone = false;
+  String? _sessionId;
   StreamSubscription? _wsSubscription;
 
   CameraController? _cameraController;
@@ -43,6 +44,7 @@ class _InterviewScreenState extends State<InterviewScreen> {
           builder: (_) => AnalysisScreen(
             channel: widget.channel,
             stream: widget.stream,
+            sessionId: _sessionId,
           ),
         ),
       );
@@ -62,6 +64,7 @@ class _InterviewScreenState extends State<InterviewScreen> {
           } else if (data["type"] == "interviewer_audio" && data["audio_base64"] != null) {
             AudioService.playInterviewerAudio(
               data["audio_base64"] as String,
+              format: (data["format"] as String?) ?? 'mp3',
               onPlaybackComplete: _onPlaybackComplete,
             );
           } else if (data["type"] == "interview_error" && data["error"] != null) {
@@ -89,7 +92,10 @@ class _InterviewScreenState extends State<InterviewScreen> {
               );
             }
           } else if (data["type"] == "interview_complete") {
-            setState(() => _navigateToAnalysisWhenDone = true);
+            setState(() {
+              _navigateToAnalysisWhenDone = true;
+              _sessionId = data["session_id"] as String?;
+            });
           } else if (data["type"] == "candidate_transcript" && data["text"] != null) {
             setState(() {
               finalTranscript = data["text"] as String;
@@ -4,6 +4,7 @@ import 'dart:io';
 import 'package:flutter/material.dart';
 import 'package:file_picker/file_picker.dart';
 import 'package:web_socket_channel/web_socket_channel.dart';
+import '../services/audio_service.dart';
 import 'interview_screen.dart';
 
 const List<String> roles = [
@@ -123,6 +124,7 @@ class _SetupScreenState extends State<SetupScreen> {
       "type": "interview_setup",
       "role": _selectedRole,
       "difficulty": _selectedDifficulty,
+      "audio_formats": AudioService.supportedAudioFormats,
     };
     debugPrint("Sending setup: $payload");
     _channel.sink.add(jsonEncode(payload));
@@ -13,6 +13,11 @@ class AudioService {
   static StreamController<Uint8List>? _audioStream;
   static bool _isRunning = false;
 
+  /// TTS output formats this device can play, most preferred first (sent in interview_setup).
+  /// Ogg/Opus playback is Android-only in flutter_sound; low-bitrate MP3 works everywhere.
+  static List<String> get supportedAudioFormats =>
+      Platform.isAndroid ? const ['opus_48000_32', 'mp3_22050_32'] : const ['mp3_22050_32'];
+
   static Future<void> startStreaming(WebSocketChannel channel) async {
     // Request mic permission before trying to open the recorder
     final status = await Permission.microphone.request();
@@ -67,6 +72,7 @@ class AudioService {
   /// [onPlaybackComplete] is called when this clip finishes (e.g. to navigate to analysis after closing message).
   static Future<void> playInterviewerAudio(
     String audioBase64, {
+    String format = 'mp3',
     void Function()? onPlaybackComplete,
   }) async {
     if (audioBase64.isEmpty) return;
@@ -80,12 +86,14 @@ class AudioService {
       } catch (_) {}
       final bytes = base64Decode(audioBase64);
       final dir = Directory.systemTemp;
-      final path = '${dir.path}/interviewer_${DateTime.now().millisecondsSinceEpoch}.mp3';
+      final isOpus = format == 'opus';
+      final path = '${dir.path}/interviewer_${DateTime.now().millisecondsSinceEpoch}.${isOpus ? 'ogg' : 'mp3'}';
       final file = File(path);
       await file.writeAsBytes(bytes);
       await _player.openPlayer();
       await _player.startPlayer(
         fromURI: path,
+        codec: isOpus ? Codec.opusOGG : Codec.mp3,
         whenFinished: () async {
           try {
             await _player.closePlayer();
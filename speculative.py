@@ -0,0 +1,120 @@
+"""
+Speculative decoding with a small draft GGUF (e.g. Llama-3.2-1B-Instruct, same tokenizer
+as the 3B interviewer). The draft proposes a few tokens greedily; llama.cpp verifies them
+in one batched pass of the 3B model and keeps only what the 3B model would have sampled,
+so the output is unchanged while decode runs several tokens per 3B forward pass.
+
+Benchmark (same prompt with and without the draft):
+    python speculative.py models/Llama-3.2-1B-Instruct-Q4_K_M.gguf
+"""
+import threading
+from typing import Any
+
+import numpy as np
+from llama_cpp import Llama
+from llama_cpp.llama_speculative import LlamaDraftModel
+
+DRAFT_PRED_TOKENS = 6
+
+
+class GGUFDraftModel(LlamaDraftModel):
+    """Draft proposer backed by a small GGUF model; tracks its own acceptance rate."""
+
+    def __init__(self, model_path: str, num_pred_tokens: int = DRAFT_PRED_TOKENS,
+                 n_ctx: int = 4096, n_threads: int = 8):
+        self.llm = Llama(
+            model_path=model_path,
+            n_ctx=n_ctx,
+            n_threads=n_threads,
+            n_gpu_layers=0,
+            verbose=False,
+        )
+        self.num_pred_tokens = num_pred_tokens
+        self._lock = threading.Lock()
+        self._last_draft = []
+        self._last_prefix_len = 0
+        self.proposed = 0
+        self.accepted = 0
+
+    def __call__(self, input_ids: np.ndarray, /, **kwargs: Any) -> np.ndarray:
+        ids = input_ids.tolist()
+        with self._lock:
+            # the verifier calls back with everything it kept, so the previous draft's
+            # accepted length is its common prefix with the new tail
+            tail = ids[self._last_prefix_len:]
+            for drafted, kept in zip(self._last_draft, tail):
+                if drafted != kept:
+                    break
+                self.accepted += 1
+
+            draft = []
+            eos = self.llm.token_eos()
+            # generate() reuses the KV cache for the longest matching prefix
+            for token in self.llm.generate(ids, top_k=1, temp=0.0, repeat_penalty=1.0):
+                if token == eos:
+                    break
+                draft.append(token)
+                if len(draft) >= self.num_pred_tokens:
+                    break
+
+            self._last_draft = draft
+            self._last_prefix_len = len(ids)
+            self.proposed += len(draft)
+        return np.array(draft, dtype=np.intc)
+
+    def begin(self) -> None:
+        """Forget the pending draft so a new prompt is not scored against the old one."""
+        with self._lock:
+            self._last_draft = []
+            self._last_prefix_len = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            rate = self.accepted / self.proposed if self.proposed else 0.0
+            return {
+                "proposed_tokens": self.proposed,
+                "accepted_tokens": self.accepted,
+                "acceptance_rate": round(rate, 3),
+            }
+
+
+# ======================================================
+# CLI: tokens/s and acceptance, with vs without draft
+# ======================================================
+if __name__ == "__main__":
+    import argparse
+    import time
+    from interview_engine import MODEL_PATH, N_CTX
+
+    parser = argparse.ArgumentParser(description="Benchmark speculative decoding.")
+    parser.add_argument("draft_model", help="Path to the small draft GGUF")
+    parser.add_argument("--max-tokens", type=int, default=120)
+    parser.add_argument("--pred-tokens", type=int, default=DRAFT_PRED_TOKENS)
+    args = parser.parse_args()
+
+    messages = [
+        {"role": "system", "content": "You are SnapAI, a concise technical interviewer."},
+        {"role": "user", "content": "Candidate response: I built a Kafka pipeline that "
+                                    "deduplicated events with Redis and wrote to Postgres."},
+    ]
+
+    def run(llm):
+        start = time.perf_counter()
+        out = llm.create_chat_completion(messages=messages, max_tokens=args.max_tokens,
+                                         temperature=0.0, top_k=1)
+        elapsed = time.perf_counter() - start
+        n = out["usage"]["completion_tokens"]
+        return out["choices"][0]["message"]["content"], n / elapsed if elapsed else 0.0
+
+    base = Llama(model_path=MODEL_PATH, n_ctx=N_CTX, n_threads=8, verbose=False)
+    base_text, base_tps = run(base)
+    del base
+
+    draft = GGUFDraftModel(args.draft_model, num_pred_tokens=args.pred_tokens, n_ctx=N_CTX)
+    spec = Llama(model_path=MODEL_PATH, n_ctx=N_CTX, n_threads=8, verbose=False, draft_model=draft)
+    spec_text, spec_tps = run(spec)
+
+    print(f"baseline:    {base_tps:.1f} tok/s")
+    print(f"speculative: {spec_tps:.1f} tok/s ({spec_tps / base_tps:.2f}x)" if base_tps else "")
+    print(f"draft stats: {draft.stats()}")
+    print("✅ identical output" if spec_text == base_text else "❌ outputs differ")
@@ -2,30 +2,338 @@
 Interview log evaluator: run via CLI or call run_evaluation(log_path) from server.
 """
 import argparse
+import csv
+import glob
+import hashlib
 import json
-import re
+import os
+import threading
+import time
+from datetime import datetime
 from pathlib import Path
-from llama_cpp import Llama
+from llama_cpp import Llama, LlamaGrammar
+
+from evaluation_cache import cache_key, evaluation_cache
+from job_scheduler import Priority, scheduler
 
 _SCRIPT_DIR = Path(__file__).resolve().parent
 MODEL_PATH = str(_SCRIPT_DIR / "models" / "Llama-3.2-3B-Instruct-Q4_K_M.gguf")
 EVALUATOR_PROMPT_PATH = _SCRIPT_DIR / "evaluator.md"
 EVALUATIONS_DIR = _SCRIPT_DIR / "evaluations"
 
+EVAL_MAX_TOKENS = 2000
+EVAL_N_CTX = 8192
+EVAL_THREADS = 8
+# Sampling parameters passed to every evaluator call (greedy decoding, so a result can be
+# cached and reused); they are part of evaluation_fingerprint
+EVAL_SAMPLING = {"temperature": 0.0, "repeat_penalty": 1.0}
+# Bump when evaluation_schema changes so stored evaluations are treated as stale
+SCHEMA_VERSION = 1
+# Single-pass output budget estimate; above it (or above n_ctx) evaluation is map-reduced
+OUTPUT_TOKENS_PER_QUESTION = 250
+OUTPUT_TOKENS_BASE = 500
+
+# Loaded on first use, shared by full and per-answer evaluation, and dropped again by
+# release_model_if_idle once nothing has used it for EVAL_MODEL_IDLE_SECONDS
+EVAL_MODEL_IDLE_SECONDS = float(os.getenv("EVAL_MODEL_IDLE_SECONDS", "120"))
+_llm = None
+_llm_lock = threading.Lock()
+_load_lock = threading.Lock()
+_last_used = 0.0
+
+METRICS = [
+    "technical_knowledge",
+    "problem_solving",
+    "decision_making",
+    "follow_up_depth",
+    "communication",
+    "confidence",
+    "practical_experience",
+    "role_fit",
+]
+
+
+def string_list_schema(max_items: int, min_items: int = 0) -> dict:
+    return {"type": "array", "items": {"type": "string"}, "minItems": min_items, "maxItems": max_items}
+
+
+def _ensure_model():
+    global _llm, _last_used
+    with _load_lock:
+        _last_used = time.monotonic()
+        if _llm is None:
+            _llm = Llama(
+                model_path=MODEL_PATH,
+                n_ctx=EVAL_N_CTX,
+                n_threads=EVAL_THREADS,
+                n_batch=512,
+                n_gpu_layers=-1,
+                verbose=False,
+            )
+        return _llm
+
+
+def release_model_if_idle(idle_seconds: float = EVAL_MODEL_IDLE_SECONDS) -> bool:
+    """
+    Drop the evaluator model (weights + 8k KV cache) when no evaluation is running and
+    none has started for idle_seconds. Callers still holding it keep it alive until they
+    finish; the next evaluation reloads it.
+    """
+    global _llm
+    with _load_lock:
+        if _llm is None or _llm_lock.locked() or time.monotonic() - _last_used < idle_seconds:
+            return False
+        _llm = None
+    print("♻️ Evaluation model released (idle)")
+    return True
+
+
+def count_tokens(text: str) -> int:
+    return len(_ensure_model().tokenize(text.encode("utf-8"), add_bos=False, special=True))
+
+
+def fit_tokens(text: str, max_tokens: int) -> str:
+    """Cut text to roughly max_tokens so a single oversized input cannot overflow n_ctx."""
+    n = count_tokens(text)
+    if n <= max_tokens:
+        return text
+    return text[: int(len(text) * max_tokens / n)].rstrip() + " …"
+
+
+def needs_map_reduce(messages: list, n_questions: int) -> bool:
+    """True if the single-pass evaluation would not fit the context or the output budget."""
+    # ~8 tokens of chat-template framing per message
+    prompt_tokens = sum(count_tokens(m["content"]) + 8 for m in messages)
+    expected_output = OUTPUT_TOKENS_BASE + n_questions * OUTPUT_TOKENS_PER_QUESTION
+    return prompt_tokens + EVAL_MAX_TOKENS > EVAL_N_CTX or expected_output > EVAL_MAX_TOKENS
+
+
+# Sections streamed member by member ("overall_scores.communication",
+# "per_question_feedback[0]"); every other top-level field is streamed whole
+STREAMED_SECTIONS = ("overall_scores", "per_question_feedback", "final_feedback_for_candidate")
+
+
+class FieldStream:
+    """
+    Incremental reader for a streamed JSON object. feed() text as it is decoded;
+    on_field(path, value) is called as soon as each field (or member of a
+    STREAMED_SECTIONS section) is closed, long before the whole object is.
+    """
+
+    def __init__(self, on_field, sections=STREAMED_SECTIONS):
+        self.on_field = on_field
+        self.sections = sections
+        self._text = []
+        self._pos = 0
+        self._in_string = False
+        self._escape = False
+        # open containers: [bracket, start of current member, member index, section key]
+        self._stack = []
+
+    def feed(self, chunk: str) -> None:
+        self._text.append(chunk)
+        text = "".join(self._text)
+        self._text = [text]
+        for i in range(self._pos, len(text)):
+            ch = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                key = None
+                if len(self._stack) == 1:
+                    head = text[self._stack[0][1]:i].strip().rstrip(":").strip()
+                    key = json.loads(head) if head else None
+                self._stack.append([ch, i + 1, 0, key])
+            elif ch in ",}]":
+                top = self._stack[-1]
+                self._member(text[top[1]:i])
+                if ch == ",":
+                    top[1], top[2] = i + 1, top[2] + 1
+                else:
+                    self._stack.pop()
+        self._pos = len(text)
+
+    def _member(self, segment: str) -> None:
+        if not segment.strip():
+            return
+        try:
+            if len(self._stack) == 1:
+                (key, value), = json.loads("{" + segment + "}").items()
+                if key not in self.sections:
+                    self.on_field(key, value)
+            elif len(self._stack) == 2 and self._stack[1][3] in self.sections:
+                bracket, _, index, section = self._stack[1]
+                if bracket == "{":
+                    (key, value), = json.loads("{" + segment + "}").items()
+                    self.on_field(f"{section}.{key}", value)
+                else:
+                    self.on_field(f"{section}[{index}]", json.loads(segment))
+        except Exception as e:
+            # progress reporting must never break the evaluation itself
+            print(f"⚠️ Partial evaluation field skipped: {e}")
+
+
+class EvaluationLengthError(ValueError):
+    """The constrained decode ran out of tokens before the JSON closed."""
+
 
-def _extract_json(text: str) -> dict:
-    """Extract the first valid JSON object from model output."""
-    match = re.search(r"\{[\s\S]*\}", text)
-    if not match:
-        raise ValueError("No JSON object found in evaluator output.")
-    return json.loads(match.group(0))
+def complete_json(messages: list, schema: dict, max_tokens: int, stats: dict = None,
+                  on_field=None) -> dict:
+    """
+    Run the evaluator model under a grammar built from schema and return the parsed object.
+    If stats is given, completion_tokens is added to it. on_field(path, value) receives
+    each field as soon as the decoder has closed it (see FieldStream).
+    """
+    global _last_used
+    grammar = LlamaGrammar.from_json_schema(json.dumps(schema), verbose=False)
+    llm = _ensure_model()
+    parts = []
+    completion_tokens = 0
+    finish_reason = None
+    fields = FieldStream(on_field) if on_field else None
+    # model lock before the CPU slot: while this job yields its slot at a checkpoint,
+    # other evaluations must queue on the lock, not hold a slot waiting for it
+    with _llm_lock, scheduler.slot(Priority.EVALUATION):
+        for chunk in llm.create_chat_completion(
+            messages=messages,
+            max_tokens=max_tokens,
+            stop=["<|eot_id|>"],
+            grammar=grammar,
+            stream=True,
+            **EVAL_SAMPLING,
+        ):
+            choice = chunk["choices"][0]
+            content = choice["delta"].get("content") or ""
+            if content:
+                # one content chunk per sampled token; role-only and final deltas are empty
+                completion_tokens += 1
+                parts.append(content)
+                if fields:
+                    fields.feed(content)
+            finish_reason = choice.get("finish_reason") or finish_reason
+            scheduler.checkpoint(Priority.EVALUATION)
+    _last_used = time.monotonic()
+    if stats is not None:
+        stats["completion_tokens"] = stats.get("completion_tokens", 0) + completion_tokens
+    if finish_reason == "length":
+        raise EvaluationLengthError(f"Evaluation hit max_tokens ({max_tokens}) before the JSON closed.")
+    return json.loads("".join(parts))
+
+
+def per_question_schema(include_question: bool = True) -> dict:
+    """Schema of one per_question_feedback entry from evaluator.md."""
+    properties = {
+        "question": {"type": "string"},
+        "candidate_answer_summary": {"type": "string"},
+        "issues": string_list_schema(4),
+        "what_was_missing": string_list_schema(4),
+        "what_a_stronger_answer_should_include": string_list_schema(4),
+        "ideal_answer_example": {"type": "string"},
+        "score": {"type": "number"},
+    }
+    if not include_question:
+        properties.pop("question")
+    return {
+        "type": "object",
+        "properties": properties,
+        "required": list(properties),
+        "additionalProperties": False,
+    }
 
 
-def run_evaluation(log_path: Path) -> dict:
+def evaluation_schema(role: str, difficulty: str, n_questions: int) -> dict:
+    """
+    JSON schema of the evaluator.md output, pinned to this interview: role/difficulty are
+    constants and per_question_feedback has exactly one entry per question.
+    """
+    return {
+        "type": "object",
+        "properties": {
+            "role": {"const": role},
+            "difficulty": {"const": difficulty},
+            "overall_scores": {
+                "type": "object",
+                "properties": {m: {"type": "number"} for m in METRICS + ["overall_score"]},
+                "required": METRICS + ["overall_score"],
+                "additionalProperties": False,
+            },
+            "confidence_level": {"enum": ["low", "medium", "high"]},
+            "hire_signal": {
+                "enum": ["strong hire", "hire", "leaning hire", "leaning no hire", "no hire"],
+            },
+            "per_question_feedback": {
+                "type": "array",
+                "items": per_question_schema(),
+                "minItems": n_questions,
+                "maxItems": n_questions,
+            },
+            "strengths": string_list_schema(5),
+            "weaknesses": string_list_schema(5),
+            "red_flags": string_list_schema(5),
+            "final_feedback_for_candidate": {
+                "type": "object",
+                "properties": {
+                    "overall_summary": {"type": "string"},
+                    "top_3_improvements": string_list_schema(3, min_items=3),
+                    "what_to_focus_on_next": {"type": "string"},
+                },
+                "required": ["overall_summary", "top_3_improvements", "what_to_focus_on_next"],
+                "additionalProperties": False,
+            },
+        },
+        "required": [
+            "role", "difficulty", "overall_scores", "confidence_level", "hire_signal",
+            "per_question_feedback", "strengths", "weaknesses", "red_flags",
+            "final_feedback_for_candidate",
+        ],
+        "additionalProperties": False,
+    }
+
+
+def _clamp_score(value) -> float:
+    return min(5.0, max(0.0, float(value)))
+
+
+def clamp_scores(result: dict) -> dict:
+    """The grammar guarantees numbers, not the 0–5 range; clamp to the scale."""
+    scores = result.get("overall_scores", {})
+    for key, value in scores.items():
+        scores[key] = _clamp_score(value)
+    for item in result.get("per_question_feedback", []):
+        item["score"] = _clamp_score(item.get("score", 0))
+    return result
+
+
+def clamped_partial(on_partial):
+    """Wrap an on_partial callback so streamed scores are clamped like the final result."""
+    if on_partial is None:
+        return None
+
+    def emit(path: str, value):
+        if path.startswith("overall_scores.") and isinstance(value, (int, float)):
+            value = _clamp_score(value)
+        elif path.startswith("per_question_feedback[") and isinstance(value, dict) and "score" in value:
+            value = {**value, "score": _clamp_score(value["score"])}
+        on_partial(path, value)
+    return emit
+
+
+def run_evaluation(log_path: Path, use_cache: bool = True, on_partial=None) -> dict:
     """
     Load interview log, run LLM evaluation, save result to evaluations/, return result.
     Can be called from server after interview completes (e.g. in a thread or executor).
+    An identical transcript evaluated before with the same prompt/model/decoding is
+    served from the evaluation cache unless use_cache is False.
+    on_partial(path, value) is called with each field as it is produced (scores clamped).
     """
+    on_partial = clamped_partial(on_partial)
     log_path = Path(log_path).resolve()
     if not log_path.exists():
         raise FileNotFoundError(f"Interview log not found: {log_path}")
@@ -41,6 +349,20 @@ def run_evaluation(log_path: Path) -> dict:
     role = metadata.get("role", "Software Engineer")
     difficulty = str(metadata.get("difficulty", "MEDIUM")).lower()
 
+    fingerprint = evaluation_fingerprint()
+    key = transcript_cache_key(interview_data, fingerprint)
+    cached = evaluation_cache.get(key) if use_cache else None
+    if cached is not None:
+        print(f"♻️ Evaluation cache hit for {log_path.name}")
+        save_evaluation(log_path, cached)
+        _write_provenance(log_path, {
+            **fingerprint,
+            "cache_key": key,
+            "cache_hit": True,
+            "evaluated_at": datetime.now().isoformat(),
+        })
+        return cached
+
     transcript_lines = []
     for pair in qa_pairs:
         q, a = pair.get("question", ""), pair.get("answer", "")
@@ -54,35 +376,216 @@ def run_evaluation(log_path: Path) -> dict:
         "interview_transcript": full_transcript,
     }
 
-    llm = Llama(
-        model_path=MODEL_PATH,
-        n_ctx=8192,
-        n_threads=8,
-        n_batch=512,
-        n_gpu_layers=-1,
-        temperature=0.0,
-        verbose=False,
-    )
-
     eval_messages = [
         {"role": "system", "content": evaluator_prompt},
         {"role": "user", "content": json.dumps(evaluation_input, indent=2)},
     ]
-    eval_output = llm.create_chat_completion(
-        messages=eval_messages,
-        max_tokens=2000,
-        stop=["<|eot_id|>"],
-    )["choices"][0]["message"]["content"]
+    stats = {}
+    started = time.perf_counter()
+    mode = "map_reduce" if needs_map_reduce(eval_messages, len(qa_pairs)) else "single_pass"
+    if mode == "single_pass":
+        try:
+            evaluation_result = clamp_scores(complete_json(
+                eval_messages,
+                evaluation_schema(role, difficulty, len(qa_pairs)),
+                EVAL_MAX_TOKENS,
+                stats=stats,
+                on_field=on_partial,
+            ))
+        except EvaluationLengthError as e:
+            print(f"⚠️ {e} Falling back to map-reduce.")
+            mode = "map_reduce"
+    if mode == "map_reduce":
+        from incremental_evaluation import map_reduce_evaluation
+        print(f"🧩 Map-reduce evaluation over {len(qa_pairs)} turns")
+        evaluation_result = map_reduce_evaluation(
+            role, difficulty, qa_pairs, stats=stats, on_partial=on_partial
+        )
+    store_evaluation(log_path, evaluation_result, key, fingerprint, mode,
+                     time.perf_counter() - started, stats)
+    return evaluation_result
 
-    evaluation_result = _extract_json(eval_output)
 
-    EVALUATIONS_DIR.mkdir(exist_ok=True)
-    output_path = EVALUATIONS_DIR / f"{log_path.stem}.evaluation.json"
-    output_path.write_text(
-        json.dumps(evaluation_result, indent=2),
-        encoding="utf-8",
+def transcript_cache_key(interview_data: dict, fingerprint: dict) -> str:
+    """Evaluation cache key of a loaded interview log."""
+    metadata = interview_data.get("metadata", {})
+    return cache_key(
+        interview_data.get("qa_pairs", []),
+        metadata.get("role", "Software Engineer"),
+        str(metadata.get("difficulty", "MEDIUM")).lower(),
+        fingerprint,
     )
-    return evaluation_result
+
+
+def store_evaluation(log_path: Path, result: dict, key: str, fingerprint: dict, mode: str,
+                     latency: float, stats: dict) -> None:
+    """Save a freshly computed result, add it to the evaluation cache and record provenance."""
+    save_evaluation(log_path, result)
+    try:
+        evaluation_cache.put(key, result)
+    except Exception as e:
+        # the result is saved; a cache failure must not turn it into a failed evaluation
+        print(f"⚠️ Evaluation cache write failed: {e}")
+    _write_provenance(log_path, {
+        **fingerprint,
+        "cache_key": key,
+        "cache_hit": False,
+        "mode": mode,
+        "latency_seconds": round(latency, 3),
+        "completion_tokens": stats.get("completion_tokens", 0),
+        "tokens_per_second": round(stats.get("completion_tokens", 0) / latency, 2) if latency else 0.0,
+        "evaluated_at": datetime.now().isoformat(),
+    })
+
+
+def evaluation_path(log_path: Path) -> Path:
+    return EVALUATIONS_DIR / f"{Path(log_path).stem}.evaluation.json"
+
+
+def _provenance_path(log_path: Path) -> Path:
+    return EVALUATIONS_DIR / f"{Path(log_path).stem}.evaluation.meta.json"
+
+
+def _write_provenance(log_path: Path, meta: dict) -> None:
+    _provenance_path(log_path).write_text(json.dumps(meta, indent=2), encoding="utf-8")
+
+
+def file_sha256(path) -> str:
+    """
+    SHA-256 of a file. Model files are GBs, so the digest is memoised next to the file
+    (<name>.sha256, keyed by size and mtime) and only recomputed when the file changes.
+    """
+    path = Path(path)
+    st = path.stat()
+    memo = path.with_name(path.name + ".sha256")
+    key = f"{st.st_size}:{st.st_mtime_ns}"
+    if memo.exists():
+        cached_key, _, digest = memo.read_text(encoding="utf-8").strip().partition(" ")
+        if cached_key == key and digest:
+            return digest
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    digest = h.hexdigest()
+    try:
+        memo.write_text(f"{key} {digest}", encoding="utf-8")
+    except OSError:
+        pass
+    return digest
+
+
+def evaluation_fingerprint() -> dict:
+    """What a stored evaluation depends on: prompt, model and decoding setup."""
+    return {
+        "prompt_sha256": hashlib.sha256(EVALUATOR_PROMPT_PATH.read_bytes()).hexdigest(),
+        "model_sha256": file_sha256(MODEL_PATH),
+        "decoding": {
+            "max_tokens": EVAL_MAX_TOKENS,
+            "n_ctx": EVAL_N_CTX,
+            **EVAL_SAMPLING,
+            "schema_version": SCHEMA_VERSION,
+        },
+    }
+
+
+def is_up_to_date(log_path: Path, fingerprint: dict) -> bool:
+    """True if log_path already has an evaluation produced with this fingerprint."""
+    meta_path = _provenance_path(log_path)
+    if not evaluation_path(log_path).exists() or not meta_path.exists():
+        return False
+    try:
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+    except (OSError, json.JSONDecodeError):
+        return False
+    return all(meta.get(k) == v for k, v in fingerprint.items())
+
+
+def save_evaluation(log_path: Path, result: dict) -> Path:
+    """Write result to evaluations/<log stem>.evaluation.json."""
+    EVALUATIONS_DIR.mkdir(exist_ok=True)
+    output_path = evaluation_path(log_path)
+    output_path.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    return output_path
+
+
+# ======================================================
+# BATCH
+# ======================================================
+def expand_log_paths(inputs: list) -> list:
+    """Files, directories (interview_log_*.json inside) and glob patterns -> sorted paths."""
+    paths = set()
+    for item in inputs:
+        p = Path(item)
+        if p.is_dir():
+            paths.update(p.glob("interview_log_*.json"))
+        elif p.exists():
+            paths.add(p)
+        else:
+            paths.update(Path(m) for m in glob.glob(item))
+    return sorted(p.resolve() for p in paths)
+
+
+def _init_batch_worker(threads: int):
+    global EVAL_THREADS
+    EVAL_THREADS = threads
+
+
+def _evaluate_for_batch(log_path: Path, use_cache: bool = True) -> dict:
+    """Evaluate one log and return its summary row (never raises)."""
+    row = {"log": str(log_path), "status": "evaluated", "latency_seconds": "",
+           "completion_tokens": "", "tokens_per_second": "", "error": ""}
+    try:
+        run_evaluation(log_path, use_cache=use_cache)
+        meta = json.loads(_provenance_path(log_path).read_text(encoding="utf-8"))
+        if meta.get("cache_hit"):
+            row["status"] = "cached"
+        for k in ("latency_seconds", "completion_tokens", "tokens_per_second"):
+            row[k] = meta.get(k, "")
+    except Exception as e:
+        row.update(status="failed", error=str(e))
+    return row
+
+
+def run_batch(log_paths: list, workers: int = 1, force: bool = False, summary_csv: Path = None) -> list:
+    """
+    Evaluate many logs with the model loaded once per worker process, skipping logs whose
+    stored evaluation already matches the current prompt, model and decoding fingerprint.
+    Writes one summary row per log to summary_csv if given.
+    """
+    fingerprint = evaluation_fingerprint()
+    rows, todo = [], []
+    for p in log_paths:
+        if not force and is_up_to_date(p, fingerprint):
+            rows.append({"log": str(p), "status": "skipped", "latency_seconds": "",
+                         "completion_tokens": "", "tokens_per_second": "", "error": ""})
+        else:
+            todo.append(p)
+    print(f"🗂️ {len(log_paths)} logs: {len(todo)} to evaluate, {len(rows)} up to date")
+
+    if workers <= 1:
+        for i, p in enumerate(todo, 1):
+            row = _evaluate_for_batch(p, use_cache=not force)
+            print(f"[{i}/{len(todo)}] {row['status']} {p.name} {row['error']}")
+            rows.append(row)
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+        # split the cores between worker processes, each with its own model copy
+        threads = max(1, EVAL_THREADS // workers)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker,
+                                 initargs=(threads,)) as pool:
+            rows_iter = pool.map(_evaluate_for_batch, todo, [not force] * len(todo))
+            for i, row in enumerate(rows_iter, 1):
+                print(f"[{i}/{len(todo)}] {row['status']} {Path(row['log']).name} {row['error']}")
+                rows.append(row)
+
+    if summary_csv:
+        with open(summary_csv, "w", newline="", encoding="utf-8") as f:
+            writer = csv.DictWriter(f, fieldnames=list(rows[0].keys()) if rows else ["log"])
+            writer.writeheader()
+            writer.writerows(rows)
+        print(f"✅ Summary written to {summary_csv}")
+    return rows
 
 
 # ======================================================
@@ -90,18 +593,34 @@ def run_evaluation(log_path: Path) -> dict:
 # ======================================================
 if __name__ == "__main__":
     parser = argparse.ArgumentParser(
-        description="Evaluate an interview log (local file)."
+        description="Evaluate interview logs (a file, a directory or a glob of interview_log_*.json)."
     )
     parser.add_argument(
-        "log_file",
-        type=Path,
-        help="Path to the interview log JSON (e.g. logs/interview_log_20260207_053019.json)",
+        "logs",
+        nargs="+",
+        help="Interview log JSON(s), e.g. logs/interview_log_20260207_053019.json, logs/ or 'logs/*.json'",
     )
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes (batch mode)")
+    parser.add_argument("--force", action="store_true", help="Re-evaluate even if up to date")
+    parser.add_argument("--summary", type=Path, default=None,
+                        help="Summary CSV path (batch mode; default evaluations/batch_summary.csv)")
     args = parser.parse_args()
-    log_path = args.log_file.resolve()
-    if not log_path.exists():
-        raise SystemExit(f"❌ Interview log file not found at {log_path}")
-    print("✅ GGUF evaluator loading...")
-    result = run_evaluation(log_path)
-    print(f"✅ Evaluation saved to {EVALUATIONS_DIR / log_path.stem}.evaluation.json")
-    print(json.dumps(result, indent=2))
+
+    log_paths = expand_log_paths(args.logs)
+    if not log_paths:
+        raise SystemExit(f"❌ No interview logs found for {' '.join(args.logs)}")
+
+    if len(log_paths) == 1 and Path(args.logs[0]).is_file():
+        log_path = log_paths[0]
+        print("✅ GGUF evaluator loading...")
+        result = run_evaluation(log_path)
+        print(f"✅ Evaluation saved to {evaluation_path(log_path)}")
+        print(json.dumps(result, indent=2))
+    else:
+        EVALUATIONS_DIR.mkdir(exist_ok=True)
+        run_batch(
+            log_paths,
+            workers=args.workers,
+            force=args.force,
+            summary_csv=args.summary or EVALUATIONS_DIR / "batch_summary.csv",
+        )
@@ -0,0 +1,488 @@
+"""
+Local-first storage for recordings, documents, logs, evaluations and manifests.
+
+storage/<username>/<folder>/<filename> on local disk is the source of truth and has the
+same key layout and method names as S3Handler, so server.py and the dashboard work
+without credentials or network. When S3 is configured, an S3Replicator thread mirrors
+every change to the bucket in the background; per-key sync state is kept in
+storage/sync.sqlite3. Point AWS_ENDPOINT_URL at MinIO or moto to test against a local
+S3 stand-in.
+"""
+import json
+import os
+import shutil
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import BinaryIO, Iterator, Optional, Union
+
+from s3_handler import (
+    AWS_REGION,
+    MANIFEST_NAME,
+    MANIFEST_VERSION,
+    S3_FETCH_WORKERS,
+    S3Handler,
+    manifest_entry_from_evaluation,
+    manifest_entry_from_log,
+)
+from botocore.exceptions import BotoCoreError, ClientError
+
+from storage_codecs import compress_json, decompress, encode_recording, load_json
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+STORAGE_DIR = _SCRIPT_DIR / "storage"
+SYNC_DB_NAME = "sync.sqlite3"
+MAX_SYNC_ATTEMPTS = 5
+SYNC_POLL_SECONDS = 5.0
+# Set to 0 to keep everything local even when S3 credentials are present
+S3_SYNC_ENABLED = os.getenv("STORAGE_S3_SYNC", "1") != "0"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sync (
+    key         TEXT PRIMARY KEY,
+    op          TEXT NOT NULL,
+    status      TEXT NOT NULL DEFAULT 'pending',
+    attempts    INTEGER NOT NULL DEFAULT 0,
+    error       TEXT,
+    updated_at  TEXT NOT NULL,
+    synced_at   TEXT
+)
+"""
+
+
+class SyncJournal:
+    """Per-key replication state: pending -> synced, or failed after MAX_SYNC_ATTEMPTS."""
+
+    def __init__(self, db_path: Path):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        with self._connect() as db:
+            db.execute(_SCHEMA)
+
+    @contextmanager
+    def _connect(self):
+        db = sqlite3.connect(self.db_path, timeout=30)
+        db.row_factory = sqlite3.Row
+        try:
+            with db:
+                yield db
+        finally:
+            db.close()
+
+    @staticmethod
+    def _now() -> str:
+        return datetime.now().isoformat()
+
+    def mark_pending(self, key: str, op: str = "put") -> None:
+        """Record a local change; a newer change replaces an older unsynced one."""
+        with self._lock, self._connect() as db:
+            db.execute(
+                "INSERT INTO sync (key, op, status, attempts, updated_at) VALUES (?, ?, 'pending', 0, ?) "
+                "ON CONFLICT(key) DO UPDATE SET op = excluded.op, status = 'pending', attempts = 0, "
+                "error = NULL, updated_at = excluded.updated_at",
+                (key, op, self._now()),
+            )
+
+    def next_pending(self, limit: int = 16) -> list:
+        with self._lock, self._connect() as db:
+            rows = db.execute(
+                "SELECT * FROM sync WHERE status = 'pending' ORDER BY updated_at LIMIT ?", (limit,)
+            ).fetchall()
+        return [dict(r) for r in rows]
+
+    def mark_synced(self, key: str, updated_at: str) -> None:
+        # only if nothing changed the key while it was uploading
+        with self._lock, self._connect() as db:
+            db.execute(
+                "UPDATE sync SET status = 'synced', error = NULL, synced_at = ? "
+                "WHERE key = ? AND updated_at = ?",
+                (self._now(), key, updated_at),
+            )
+
+    def mark_missing(self, key: str, updated_at: str) -> None:
+        """A pending put whose local file is gone: nothing to upload, so stop retrying it."""
+        with self._lock, self._connect() as db:
+            db.execute(
+                "UPDATE sync SET status = 'failed', error = 'local file missing' "
+                "WHERE key = ? AND updated_at = ?",
+                (key, updated_at),
+            )
+
+    def record_synced(self, key: str) -> None:
+        """Record a key that already matches S3 (fetched from the bucket)."""
+        now = self._now()
+        with self._lock, self._connect() as db:
+            db.execute(
+                "INSERT INTO sync (key, op, status, attempts, updated_at, synced_at) "
+                "VALUES (?, 'put', 'synced', 0, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET status = 'synced', error = NULL, synced_at = excluded.synced_at",
+                (key, now, now),
+            )
+
+    def mark_failed(self, key: str, error: str) -> str:
+        with self._lock, self._connect() as db:
+            row = db.execute("SELECT attempts FROM sync WHERE key = ?", (key,)).fetchone()
+            attempts = (row["attempts"] if row else 0) + 1
+            status = "failed" if attempts >= MAX_SYNC_ATTEMPTS else "pending"
+            db.execute(
+                "UPDATE sync SET status = ?, attempts = ?, error = ? WHERE key = ?",
+                (status, attempts, error, key),
+            )
+        return status
+
+    def status(self, key: str) -> Optional[str]:
+        with self._lock, self._connect() as db:
+            row = db.execute("SELECT status FROM sync WHERE key = ?", (key,)).fetchone()
+        return row["status"] if row else None
+
+    def summary(self) -> dict:
+        with self._lock, self._connect() as db:
+            rows = db.execute("SELECT status, COUNT(*) AS n FROM sync GROUP BY status").fetchall()
+        return {r["status"]: r["n"] for r in rows}
+
+
+class S3Replicator(threading.Thread):
+    """Background mirror of LocalStorage into S3, driven by the SyncJournal."""
+
+    def __init__(self, storage: "LocalStorage", s3: S3Handler):
+        super().__init__(name="s3-replicator", daemon=True)
+        self.storage = storage
+        self.s3 = s3
+        self._wake = threading.Event()
+        self._stop_event = threading.Event()
+
+    def wake(self) -> None:
+        self._wake.set()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+        self._wake.set()
+
+    def sync_once(self) -> int:
+        """Replicate the pending changes; returns how many were synced."""
+        synced = 0
+        for job in self.storage.journal.next_pending():
+            key = job["key"]
+            try:
+                if job["op"] == "delete":
+                    if not self.s3.delete_file(key):
+                        raise RuntimeError("delete failed")
+                else:
+                    path = self.storage.local_path(key)
+                    if not path.exists():
+                        # a delete would have replaced this row (key is the primary key), so
+                        # the file went away outside LocalStorage; retrying can't help
+                        self.storage.journal.mark_missing(key, job["updated_at"])
+                        print(f"⚠️ S3 sync of {key} skipped: local file missing")
+                        continue
+                    username, _, name = key.partition("/")
+                    if name == MANIFEST_NAME:
+                        self._sync_manifest(username)
+                        self.storage.journal.mark_synced(key, job["updated_at"])
+                        synced += 1
+                        continue
+                    with open(path, "rb") as f:
+                        result = self.s3.upload_fileobj(f, key, path.name)
+                    if not result["success"]:
+                        raise RuntimeError(result["message"])
+                self.storage.journal.mark_synced(key, job["updated_at"])
+                synced += 1
+            except Exception as e:
+                status = self.storage.journal.mark_failed(key, str(e))
+                print(f"❌ S3 sync of {key} failed ({status}): {e}")
+        return synced
+
+    def _sync_manifest(self, username: str) -> None:
+        # merged through S3Handler.update_manifest, so sessions that other machines
+        # recorded in the remote manifest are kept instead of overwritten
+        manifest = self.storage.get_manifest(username)
+        if manifest is None:
+            raise RuntimeError("local manifest is unreadable")
+        if not self.s3.update_manifest(username, manifest.get("sessions", {}),
+                                       backfilled=manifest.get("backfilled")):
+            raise RuntimeError("manifest merge failed")
+
+    def run(self):
+        while not self._stop_event.is_set():
+            try:
+                if self.sync_once():
+                    continue
+            except Exception as e:
+                print(f"❌ S3 replicator error: {e}")
+            self._wake.wait(SYNC_POLL_SECONDS)
+            self._wake.clear()
+
+
+class LocalStorage:
+    """S3Handler-compatible store on local disk; optional background replication to S3."""
+
+    def __init__(self, root: Path = STORAGE_DIR, s3: S3Handler = None):
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.journal = SyncJournal(self.root / SYNC_DB_NAME)
+        self.s3 = s3
+        self.replicator = S3Replicator(self, s3) if s3 is not None else None
+        self._manifest_lock = threading.Lock()
+
+    # ---- paths and bookkeeping ----
+    def local_path(self, key: str) -> Path:
+        path = (self.root / key).resolve()
+        if self.root.resolve() not in path.parents:
+            raise ValueError(f"Key escapes storage root: {key}")
+        return path
+
+    def _changed(self, key: str, op: str = "put") -> None:
+        self.journal.mark_pending(key, op)
+        if self.replicator is not None:
+            self.replicator.wake()
+
+    def _result(self, key: str) -> dict:
+        url = (
+            f"https://{self.s3.bucket_name}.s3.{AWS_REGION}.amazonaws.com/{key}"
+            if self.s3 is not None else self.local_path(key).as_uri()
+        )
+        return {'success': True, 'message': 'Stored locally', 'url': url, 'key': key,
+                'filename': Path(key).name, 'local_path': str(self.local_path(key))}
+
+    def start(self) -> None:
+        if self.replicator is not None and not self.replicator.is_alive():
+            self.replicator.start()
+
+    def sync_status(self) -> dict:
+        return {"remote": self.s3 is not None, **self.journal.summary()}
+
+    # ---- writes (S3Handler method names) ----
+    def put_bytes(self, key: str, data: bytes) -> dict:
+        path = self.local_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        self._changed(key)
+        return self._result(key)
+
+    def put_file(self, local_file_path: str, key: str) -> dict:
+        if not os.path.exists(local_file_path):
+            return {'success': False, 'message': f'File not found: {local_file_path}', 'url': None, 'key': None}
+        path = self.local_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.unlink(missing_ok=True)
+        try:
+            # recordings are large: a hard link stores them once
+            os.link(local_file_path, path)
+        except OSError:
+            shutil.copy2(local_file_path, path)
+        self._changed(key)
+        return self._result(key)
+
+    def upload_file(self, local_file_path: str, username: str,
+                    custom_filename: str = None, folder: str = "recordings") -> dict:
+        filename = custom_filename or os.path.basename(local_file_path)
+        return self.put_file(local_file_path, f"{username}/{folder}/{filename}")
+
+    def upload_audio_recording(self, local_file_path: str, username: str) -> dict:
+        if Path(local_file_path).suffix.lower() == ".wav" and os.path.exists(local_file_path):
+            # raw PCM WAV is re-encoded (FLAC/Opus) before it is stored
+            return self.upload_audio_recording_bytes(Path(local_file_path).read_bytes(), username)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        filename = f"interview_{timestamp}{Path(local_file_path).suffix}"
+        return self.upload_file(local_file_path, username, filename, folder="recordings")
+
+    def upload_audio_recording_bytes(self, data: Union[bytes, BinaryIO], username: str,
+                                     ext: str = ".wav") -> dict:
+        if ext.lower() == ".wav":
+            data, ext = encode_recording(data if isinstance(data, (bytes, bytearray)) else data.read())
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        return self.upload_stream(data, username, f"interview_{timestamp}{ext}", folder="recordings")
+
+    def upload_document(self, local_file_path: str, username: str, doc_type: str, timestamp: int) -> dict:
+        filename = f"{doc_type}_{timestamp}{Path(local_file_path).suffix}"
+        return self.upload_file(local_file_path, username, filename, folder="documents")
+
+    def upload_document_bytes(self, data: Union[bytes, BinaryIO], username: str, doc_type: str,
+                              timestamp: int, ext: str) -> dict:
+        return self.upload_stream(data, username, f"{doc_type}_{timestamp}{ext}", folder="documents")
+
+    def upload_stream(self, data: Union[bytes, BinaryIO], username: str, filename: str,
+                      folder: str = "recordings") -> dict:
+        data = data if isinstance(data, (bytes, bytearray)) else data.read()
+        return self.put_bytes(f"{username}/{folder}/{filename}", bytes(data))
+
+    def upload_log_file(self, local_file_path: str, username: str, session_id: str) -> dict:
+        key = f"{username}/logfile/interview_log_{session_id}.json"
+        result = self._put_json_file(local_file_path, key)
+        if result['success']:
+            self._record_in_manifest(username, session_id, local_file_path, key, manifest_entry_from_log)
+        return result
+
+    def upload_evaluation_file(self, local_file_path: str, username: str, session_id: str) -> dict:
+        key = f"{username}/evaluations/interview_log_{session_id}.evaluation.json"
+        result = self._put_json_file(local_file_path, key)
+        if result['success']:
+            self._record_in_manifest(username, session_id, local_file_path, key,
+                                     manifest_entry_from_evaluation)
+        return result
+
+    def _put_json_file(self, local_file_path: str, key: str) -> dict:
+        """Store a JSON file as compact, compressed JSON under its .json key."""
+        try:
+            with open(local_file_path, "r", encoding="utf-8") as f:
+                return self.put_bytes(key, compress_json(json.load(f)))
+        except (OSError, json.JSONDecodeError) as e:
+            return {'success': False, 'message': str(e), 'url': None, 'key': None}
+
+    def delete_file(self, key: str) -> bool:
+        try:
+            self.local_path(key).unlink()
+        except FileNotFoundError:
+            return False
+        self._changed(key, "delete")
+        return True
+
+    # ---- manifest ----
+    def _record_in_manifest(self, username: str, session_id: str, local_file_path: str,
+                            key: str, entry_fn) -> None:
+        try:
+            with open(local_file_path, "r", encoding="utf-8") as f:
+                fields = entry_fn(json.load(f), key)
+            self.update_manifest(username, {session_id: fields})
+        except Exception as e:
+            print(f"⚠️ Manifest update failed for {session_id}: {e}")
+
+    def get_manifest(self, username: str) -> Optional[dict]:
+        try:
+            return load_json(self.local_path(f"{username}/{MANIFEST_NAME}").read_bytes())
+        except (OSError, ValueError):
+            return None
+
+    def update_manifest(self, username: str, updates: dict, backfilled: bool = None) -> bool:
+        with self._manifest_lock:
+            manifest = self.get_manifest(username) or {"version": MANIFEST_VERSION, "sessions": {}}
+            for session_id, fields in updates.items():
+                entry = manifest["sessions"].setdefault(session_id, {"session_id": session_id})
+                entry.update(fields)
+                entry["updated_at"] = datetime.now().isoformat()
+            if backfilled is not None:
+                manifest["backfilled"] = backfilled
+            self.put_bytes(f"{username}/{MANIFEST_NAME}", compress_json(manifest))
+        return True
+
+    # ---- reads ----
+    def iter_user_files(self, username: str, folder: str = None) -> Iterator[dict]:
+        base = self.local_path(f"{username}/{folder}" if folder else username)
+        if not base.is_dir():
+            return
+        for path in sorted(base.rglob("*")):
+            if not path.is_file() or path.name.endswith(".tmp"):
+                continue
+            key = path.relative_to(self.root.resolve()).as_posix()
+            st = path.stat()
+            yield {'key': key, 'size': st.st_size,
+                   'last_modified': datetime.fromtimestamp(st.st_mtime), 'url': path.as_uri()}
+
+    def list_user_files(self, username: str, folder: str = None) -> list:
+        return list(self.iter_user_files(username, folder))
+
+    def get_file_bytes(self, key: str) -> Optional[bytes]:
+        try:
+            return self.local_path(key).read_bytes()
+        except OSError:
+            return None
+
+    def get_file_content(self, key: str, encoding: str = "utf-8") -> Optional[str]:
+        data = self.get_file_bytes(key)
+        return decompress(data).decode(encoding) if data is not None else None
+
+    def get_many(self, keys: list, encoding: str = "utf-8", max_workers: int = None) -> dict:
+        return {key: self.get_file_content(key, encoding) for key in keys}
+
+    def get_presigned_url(self, key: str, expiration: int = 3600) -> Optional[str]:
+        if self.s3 is not None and self.journal.status(key) == "synced":
+            return self.s3.get_presigned_url(key, expiration)
+        return self.local_path(key).as_uri()
+
+    # ---- restore ----
+    def hydrate_from_remote(self, username: str) -> int:
+        """
+        Copy a user's objects that exist only in S3 (e.g. recorded on another machine)
+        into local storage, marked as synced, and merge the remote manifest into the local
+        one. Returns the number of objects fetched; offline, local data is left as is.
+        """
+        if self.s3 is None:
+            return 0
+        try:
+            return self._hydrate(username)
+        except (BotoCoreError, ClientError, OSError) as e:
+            print(f"⚠️ Could not fetch {username}'s objects from S3, using local data: {e}")
+            return 0
+
+    def _hydrate(self, username: str) -> int:
+        manifest_key = self.s3.manifest_key(username)
+        fetched = self._merge_remote_manifest(username)
+        missing = [f["key"] for f in self.s3.iter_user_files(username)
+                   if f["key"] != manifest_key and not self.local_path(f["key"]).exists()]
+        if not missing:
+            return fetched
+        with ThreadPoolExecutor(max_workers=min(S3_FETCH_WORKERS, len(missing))) as pool:
+            bodies = dict(zip(missing, pool.map(self.s3.get_file_bytes, missing)))
+        for key, body in bodies.items():
+            if body is None:
+                continue
+            path = self.local_path(key)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_bytes(body)
+            self.journal.record_synced(key)
+            fetched += 1
+        return fetched
+
+    def _merge_remote_manifest(self, username: str) -> int:
+        """Add sessions from the remote manifest to the local one (newer entry wins); 1 if it changed."""
+        remote = self.s3.get_manifest(username)
+        if not remote:
+            return 0
+        key = f"{username}/{MANIFEST_NAME}"
+        with self._manifest_lock:
+            local = self.get_manifest(username)
+            if local is None:
+                path = self.local_path(key)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_bytes(compress_json(remote))
+                self.journal.record_synced(key)
+                return 1
+            changed = False
+            for session_id, entry in remote.get("sessions", {}).items():
+                mine = local["sessions"].get(session_id)
+                if mine is None or entry.get("updated_at", "") > mine.get("updated_at", ""):
+                    local["sessions"][session_id] = entry
+                    changed = True
+            if remote.get("backfilled") and not local.get("backfilled"):
+                local["backfilled"] = True
+                changed = True
+            if changed:
+                # pending again: the replicator merges the result back into S3
+                self.put_bytes(key, compress_json(local))
+        return int(changed)
+
+
+_storage = None
+_storage_lock = threading.Lock()
+
+
+def get_storage() -> LocalStorage:
+    """Process-wide LocalStorage; replicates to S3 when a bucket is configured."""
+    global _storage
+    with _storage_lock:
+        if _storage is None:
+            s3 = None
+            if S3_SYNC_ENABLED:
+                handler = S3Handler()
+                if handler.s3_client and handler.bucket_name:
+                    s3 = handler
+            _storage = LocalStorage(STORAGE_DIR, s3)
+            _storage.start()
+            print(f"✅ Local storage at {STORAGE_DIR}" + (" (syncing to S3)" if s3 else ""))
+        return _storage
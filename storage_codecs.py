@@ -0,0 +1,119 @@
+"""
+Compression for stored objects. Logs, evaluations and manifests are stored as compact
+JSON compressed with gzip (or zstd when the zstandard package is installed); their keys
+keep the .json name and S3 gets a matching Content-Encoding. Recordings are stored as
+FLAC (lossless) or Opus instead of raw 16 kHz WAV when soundfile is installed.
+Readers detect compression from the leading magic bytes, so objects written before
+this change still load.
+"""
+import gzip
+import io
+import json
+import os
+from pathlib import Path
+from typing import Optional, Union
+
+JSON_CODEC = os.getenv("STORAGE_JSON_CODEC", "gzip").lower()    # gzip | zstd | none
+AUDIO_CODEC = os.getenv("STORAGE_AUDIO_CODEC", "flac").lower()  # flac | opus | wav
+ZSTD_LEVEL = 10
+
+GZIP_MAGIC = b"\x1f\x8b"
+ZSTD_MAGIC = b"\x28\xb5\x2f\xfd"
+
+# codec -> (soundfile format, subtype, file extension)
+_AUDIO_FORMATS = {
+    "flac": ("FLAC", "PCM_16", ".flac"),
+    "opus": ("OGG", "OPUS", ".ogg"),
+}
+
+_zstd = None
+_soundfile = None
+_warned = set()  # missing optional packages already reported
+
+
+def _warn_once(package: str, message: str) -> None:
+    if package not in _warned:
+        _warned.add(package)
+        print(f"⚠️ {message}")
+
+
+def _load_zstd():
+    global _zstd
+    if _zstd is None:
+        import zstandard
+        _zstd = zstandard
+    return _zstd
+
+
+def _load_soundfile():
+    global _soundfile
+    if _soundfile is None:
+        import soundfile
+        _soundfile = soundfile
+    return _soundfile
+
+
+def content_encoding(head: bytes) -> Optional[str]:
+    """'gzip', 'zstd' or None, from the first bytes of a stored object."""
+    if head.startswith(GZIP_MAGIC):
+        return "gzip"
+    if head.startswith(ZSTD_MAGIC):
+        return "zstd"
+    return None
+
+
+def compress_json(data) -> bytes:
+    """Compact JSON (no indentation) compressed with JSON_CODEC."""
+    raw = json.dumps(data, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+    if JSON_CODEC == "zstd":
+        try:
+            return _load_zstd().ZstdCompressor(level=ZSTD_LEVEL).compress(raw)
+        except ImportError:
+            _warn_once("zstandard", "zstandard not installed, compressing JSON with gzip")
+    if JSON_CODEC == "none":
+        return raw
+    # mtime=0 keeps the output (and so the S3 ETag) identical for identical JSON
+    return gzip.compress(raw, compresslevel=6, mtime=0)
+
+
+def decompress(data: bytes) -> bytes:
+    """Undo compress_json; uncompressed data is returned unchanged."""
+    encoding = content_encoding(data[:4])
+    if encoding == "gzip":
+        return gzip.decompress(data)
+    if encoding == "zstd":
+        # stream reader: frames written by compress() carry the size, but don't rely on it
+        with _load_zstd().ZstdDecompressor().stream_reader(io.BytesIO(data)) as reader:
+            return reader.read()
+    return data
+
+
+def load_json(data: bytes):
+    return json.loads(decompress(data))
+
+
+def encode_recording(wav: Union[bytes, str, Path]) -> tuple:
+    """
+    (audio bytes, extension) for a WAV recording, re-encoded with AUDIO_CODEC.
+    Falls back to the original WAV if the codec is "wav", soundfile is missing, or
+    encoding fails.
+    """
+    if isinstance(wav, (str, Path)):
+        wav = Path(wav).read_bytes()
+    fmt = _AUDIO_FORMATS.get(AUDIO_CODEC)
+    if fmt is None:
+        return wav, ".wav"
+    try:
+        sf = _load_soundfile()
+    except (ImportError, OSError) as e:
+        # missing package or libsndfile: every recording falls back, so say it once
+        _warn_once("soundfile", f"soundfile unavailable ({e}), storing recordings as WAV")
+        return wav, ".wav"
+    try:
+        samples, sample_rate = sf.read(io.BytesIO(wav), dtype="int16")
+        out = io.BytesIO()
+        sf.write(out, samples, sample_rate, format=fmt[0], subtype=fmt[1])
+        return out.getvalue(), fmt[2]
+    except Exception as e:
+        print(f"⚠️ {AUDIO_CODEC} encoding failed, storing WAV: {e}")
+        return wav, ".wav"
@@ -1,18 +1,66 @@
 import os
+import threading
 from enum import Enum
+from pathlib import Path
+from typing import Iterator
+
 from dotenv import load_dotenv
-from elevenlabs.client import ElevenLabs
+
+from tts_cache import tts_cache, tts_cache_key
+from tts_resilience import CircuitBreaker, hedged_call, is_fatal_tts_error
 
 # =========================================================
-# ENV + CLIENT
+# ENV
 # =========================================================
 load_dotenv()
 
+_SCRIPT_DIR = Path(__file__).resolve().parent
+
+# "elevenlabs" (cloud) or "piper" (local ONNX voice, works air-gapped)
+TTS_BACKEND = os.getenv("TTS_BACKEND", "elevenlabs").strip().lower()
 API_KEY = os.getenv("ELEVENLABS_API_KEY")
-if not API_KEY:
-    raise RuntimeError("❌ ELEVENLABS_API_KEY not found")
 
-client = ElevenLabs(api_key=API_KEY)
+MODEL_ID = "eleven_multilingual_v2"
+OUTPUT_FORMAT = "mp3_44100_128"
+# Speech needs far less than music: used when a client does not negotiate a format
+DEFAULT_CLIENT_FORMAT = "mp3_22050_32"
+# What each phone build asks for in interview_setup (AudioService.supportedAudioFormats),
+# most preferred first; pre-warming covers whatever these negotiate to
+CLIENT_FORMAT_PREFERENCES = {
+    "android": ["opus_48000_32", "mp3_22050_32"],
+    "ios": ["mp3_22050_32"],
+}
+ELEVENLABS_BASE_URL = "https://api.elevenlabs.io"
+
+# Shared HTTP pool: idle connections are kept this long so consecutive questions
+# reuse the TLS session instead of handshaking again
+TTS_KEEPALIVE_SECONDS = float(os.getenv("TTS_KEEPALIVE_SECONDS", "120"))
+TTS_MAX_CONNECTIONS = 8
+
+PIPER_MODEL_PATH = os.getenv(
+    "PIPER_MODEL_PATH", str(_SCRIPT_DIR / "models" / "en_US-lessac-medium.onnx")
+)
+PIPER_MP3_KBPS = 64
+
+# Resilience: per-call deadline, hedge a second request when the first is slow,
+# and fall back to another backend (local voice by default) when the primary fails
+TTS_DEADLINE_SECONDS = float(os.getenv("TTS_DEADLINE_SECONDS", "8"))
+TTS_HEDGE_AFTER_SECONDS = float(os.getenv("TTS_HEDGE_AFTER_SECONDS", "2.5"))
+TTS_FALLBACK_BACKEND = os.getenv(
+    "TTS_FALLBACK_BACKEND", "piper" if TTS_BACKEND != "piper" else ""
+).strip().lower()
+
+# Roles offered by the mobile setup screen; their openings are pre-warmed
+COMMON_ROLES = [
+    "Software Engineer",
+    "Product Manager",
+    "Data Scientist",
+    "UX Designer",
+    "DevOps Engineer",
+    "Marketing Manager",
+    "Sales Representative",
+    "Project Manager",
+]
 
 # =========================================================
 # QUESTION TYPES
@@ -58,82 +106,416 @@ def shape_text(text: str, question_type: QuestionType) -> str:
         return text.replace("?", "...?")
     return text
 
+# =========================================================
+# BACKENDS
+# =========================================================
+class TTSBackend:
+    """
+    Turns shaped text into audio chunks. Subclasses set name, model_id, output_format
+    (their default) and supported_formats (ElevenLabs-style names, e.g. "mp3_22050_32").
+    """
+
+    name = "base"
+    model_id = ""
+    output_format = ""
+    supported_formats = ()
+
+    def voice_id(self, role: str) -> str:
+        raise NotImplementedError
+
+    def resolve_format(self, output_format: str = None) -> str:
+        """The format this backend will actually produce for a requested one."""
+        return output_format if output_format in self.supported_formats else self.output_format
+
+    def stream(self, text: str, voice_id: str, settings: dict, output_format: str) -> Iterator[bytes]:
+        raise NotImplementedError
+
+    def warm_up(self) -> None:
+        """Get ready for the first request (open connections, load weights)."""
+
+
+def _http_client():
+    """Pooled keep-alive httpx client, HTTP/2 when the h2 package is installed."""
+    import httpx
+
+    try:
+        import h2  # noqa: F401
+        http2 = True
+    except ImportError:
+        http2 = False
+    return httpx.Client(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=TTS_MAX_CONNECTIONS,
+            max_keepalive_connections=TTS_MAX_CONNECTIONS,
+            keepalive_expiry=TTS_KEEPALIVE_SECONDS,
+        ),
+        timeout=httpx.Timeout(TTS_DEADLINE_SECONDS * 2, connect=5.0),
+    )
+
+
+class ElevenLabsBackend(TTSBackend):
+    name = "elevenlabs"
+    model_id = MODEL_ID
+    output_format = OUTPUT_FORMAT
+    supported_formats = (
+        "opus_48000_32", "opus_48000_64",
+        "mp3_22050_32", "mp3_44100_64", "mp3_44100_128",
+    )
+
+    def __init__(self):
+        from elevenlabs.client import ElevenLabs
+
+        if not API_KEY:
+            raise RuntimeError("❌ ELEVENLABS_API_KEY not found")
+        self.http = _http_client()
+        self.client = ElevenLabs(api_key=API_KEY, httpx_client=self.http)
+
+    def warm_up(self) -> None:
+        # any response will do: the point is the TCP + TLS session left in the pool
+        self.http.head(ELEVENLABS_BASE_URL, headers={"xi-api-key": API_KEY})
+
+    def voice_id(self, role: str) -> str:
+        return VOICE_IDS.get(role, VOICE_IDS["primary"])
+
+    def stream(self, text: str, voice_id: str, settings: dict, output_format: str) -> Iterator[bytes]:
+        # ElevenLabs yields audio chunks as they are generated
+        yield from self.client.text_to_speech.convert(
+            text=text,
+            voice_id=voice_id,
+            model_id=self.model_id,
+            output_format=output_format,
+            voice_settings=settings,
+        )
+
+
+class PiperBackend(TTSBackend):
+    """
+    Local CPU voice (Piper / VITS exported to ONNX) encoded to MP3 with lameenc.
+    One voice per model file; voice settings only nudge the speaking rate.
+    MP3 only, at the voice's native sample rate; the requested bitrate is honoured.
+    """
+
+    name = "piper"
+    model_id = "piper"
+
+    def __init__(self, model_path: str = PIPER_MODEL_PATH):
+        from piper import PiperVoice
+
+        if not Path(model_path).exists():
+            raise RuntimeError(f"❌ Piper voice not found: {model_path}")
+        self.model_path = model_path
+        self.voice = PiperVoice.load(model_path)
+        self.sample_rate = self.voice.config.sample_rate
+        self.output_format = f"mp3_{self.sample_rate}_{PIPER_MP3_KBPS}"
+        self.supported_formats = (f"mp3_{self.sample_rate}_32", self.output_format)
+
+    def voice_id(self, role: str) -> str:
+        return Path(self.model_path).stem
+
+    def resolve_format(self, output_format: str = None) -> str:
+        if output_format and output_format.startswith("mp3_"):
+            return f"mp3_{self.sample_rate}_{output_format.rsplit('_', 1)[-1]}"
+        return self.output_format
+
+    def warm_up(self) -> None:
+        # first ONNX run allocates its buffers; do it before a candidate is waiting
+        for _ in self.voice.synthesize("Ready."):
+            pass
+
+    def stream(self, text: str, voice_id: str, settings: dict, output_format: str) -> Iterator[bytes]:
+        import lameenc
+        from piper import SynthesisConfig
+
+        encoder = lameenc.Encoder()
+        encoder.set_bit_rate(int(output_format.rsplit("_", 1)[-1]))
+        encoder.set_in_sample_rate(self.sample_rate)
+        encoder.set_channels(1)
+        encoder.set_quality(2)
+        # calmer (higher stability) voice settings -> slightly slower speech
+        config = SynthesisConfig(length_scale=0.9 + 0.2 * settings.get("stability", 0.5))
+        # Piper synthesizes sentence by sentence, so audio starts before the text is done
+        for chunk in self.voice.synthesize(text, syn_config=config):
+            mp3 = encoder.encode(chunk.audio_int16_bytes)
+            if mp3:
+                yield bytes(mp3)
+        tail = encoder.flush()
+        if tail:
+            yield bytes(tail)
+
+
+_BACKENDS = {
+    "elevenlabs": ElevenLabsBackend,
+    "piper": PiperBackend,
+}
+_backends = {}
+_backend_lock = threading.Lock()
+_breakers = {name: CircuitBreaker(name) for name in _BACKENDS}
+
+
+def get_backend(name: str = None) -> TTSBackend:
+    """A TTS backend by name (default: the deployment's TTS_BACKEND), created on first use."""
+    name = name or TTS_BACKEND
+    with _backend_lock:
+        if name not in _backends:
+            if name not in _BACKENDS:
+                raise RuntimeError(f"❌ Unknown TTS backend {name!r} (use {', '.join(_BACKENDS)})")
+            _backends[name] = _BACKENDS[name]()
+            print(f"✅ TTS backend: {name}")
+        return _backends[name]
+
+
 # =========================================================
 # CORE FUNCTION: TEXT -> MP3 BYTES
 # =========================================================
+def synthesize_mp3_stream(
+    text: str,
+    *,
+    role: str = "primary",
+    question_type: QuestionType = QuestionType.TECHNICAL,
+    confidence: float = 0.7,
+    use_cache: bool = True,
+    backend: TTSBackend = None,
+    output_format: str = None,
+) -> Iterator[bytes]:
+    """
+    Yields audio chunks (MP3 unless another output_format was negotiated) as the backend
+    produces them. A cached line is yielded in one piece; a fresh one is cached once complete.
+    """
+    backend = backend or get_backend()
+    voice_id = backend.voice_id(role)
+    text = shape_text(text, question_type)
+    settings = voice_settings(question_type, confidence)
+    output_format = backend.resolve_format(output_format)
+
+    key = tts_cache_key(text, voice_id, backend.model_id, output_format, settings)
+    if use_cache:
+        cached = tts_cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+
+    chunks = []
+    for chunk in backend.stream(text, voice_id, settings, output_format):
+        chunks.append(chunk)
+        yield chunk
+    if use_cache and chunks:
+        audio = b"".join(chunks)
+        tts_cache.put(key, audio, ext="ogg" if detect_audio_format(audio) == "opus" else "mp3")
+
+
 def synthesize_mp3(
     text: str,
     *,
     role: str = "primary",
     question_type: QuestionType = QuestionType.TECHNICAL,
     confidence: float = 0.7,
+    use_cache: bool = True,
+    backend: TTSBackend = None,
+    output_format: str = None,
 ) -> bytes:
     """
-    Returns raw MP3 bytes.
+    Returns raw MP3 bytes (or the negotiated output_format).
     Caller decides what to do with them (WS, file, mobile, etc.)
+    Identical requests are served from the on-disk TTS cache.
     """
+    return b"".join(synthesize_mp3_stream(
+        text,
+        role=role,
+        question_type=question_type,
+        confidence=confidence,
+        use_cache=use_cache,
+        backend=backend,
+        output_format=output_format,
+    ))
 
-    voice_id = VOICE_IDS.get(role, VOICE_IDS["primary"])
-    text = shape_text(text, question_type)
 
-    audio_stream = client.text_to_speech.convert(
-        text=text,
-        voice_id=voice_id,
-        model_id="eleven_multilingual_v2",
-        output_format="mp3_44100_128",
-        voice_settings=voice_settings(question_type, confidence),
-    )
+def synthesize_resilient_mp3(
+    text: str,
+    *,
+    role: str = "primary",
+    question_type: QuestionType = QuestionType.TECHNICAL,
+    confidence: float = 0.7,
+    output_format: str = None,
+) -> bytes:
+    """
+    synthesize_mp3 with bounded latency: each backend gets TTS_DEADLINE_SECONDS (with a
+    hedged second request after TTS_HEDGE_AFTER_SECONDS); on failure, or while its
+    circuit is open, the next backend is used. A backend with an open circuit can still
+    answer from the cache.
+    """
+    chain = [TTS_BACKEND]
+    if TTS_FALLBACK_BACKEND and TTS_FALLBACK_BACKEND != TTS_BACKEND:
+        chain.append(TTS_FALLBACK_BACKEND)
+
+    kwargs = {"role": role, "question_type": question_type, "confidence": confidence,
+              "output_format": output_format}
+    errors = []
+    for name in chain:
+        breaker = _breakers[name]
+        try:
+            backend = get_backend(name)
+        except Exception as e:
+            breaker.record_failure(fatal=True)
+            errors.append(f"{name}: {e}")
+            continue
 
-    # ElevenLabs yields MP3 chunks -> concatenate
-    mp3_bytes = b"".join(audio_stream)
-    return mp3_bytes
+        if not breaker.allow():
+            voice_id = backend.voice_id(role)
+            key = tts_cache_key(shape_text(text, question_type), voice_id, backend.model_id,
+                                backend.resolve_format(output_format),
+                                voice_settings(question_type, confidence))
+            cached = tts_cache.get(key)
+            if cached is not None:
+                return cached
+            errors.append(f"{name}: circuit open")
+            continue
+
+        try:
+            audio = hedged_call(
+                lambda: synthesize_mp3(text, backend=backend, **kwargs),
+                TTS_DEADLINE_SECONDS,
+                TTS_HEDGE_AFTER_SECONDS,
+            )
+        except Exception as e:
+            breaker.record_failure(fatal=is_fatal_tts_error(e))
+            errors.append(f"{name}: {e}")
+            print(f"⚠️ TTS via {name} failed: {e}")
+            continue
+        breaker.record_success()
+        return audio
+
+    raise RuntimeError("❌ TTS unavailable (" + "; ".join(errors) + ")")
+
+
+def negotiate_format(requested: list = None) -> str:
+    """
+    Pick the first of the client's formats (most preferred first) that the deployment's
+    backend can produce; DEFAULT_CLIENT_FORMAT when the client did not say.
+    """
+    try:
+        backend = get_backend()
+    except Exception as e:
+        print(f"⚠️ TTS format negotiation without backend: {e}")
+        return DEFAULT_CLIENT_FORMAT
+    for fmt in requested or []:
+        if fmt in backend.supported_formats:
+            return fmt
+    return backend.resolve_format(DEFAULT_CLIENT_FORMAT)
+
+
+def detect_audio_format(audio: bytes) -> str:
+    """"opus" for Ogg/Opus, else "mp3" (a fallback voice may not honour the request)."""
+    return "opus" if audio[:4] == b"OggS" else "mp3"
+
+
+def warm_up(include_fallback: bool = True) -> None:
+    """Create the configured backend(s) and open their connections (call at server start)."""
+    names = [TTS_BACKEND]
+    if include_fallback and TTS_FALLBACK_BACKEND and TTS_FALLBACK_BACKEND != TTS_BACKEND:
+        names.append(TTS_FALLBACK_BACKEND)
+    for name in names:
+        try:
+            get_backend(name).warm_up()
+            print(f"✅ TTS {name} warmed up")
+        except Exception as e:
+            print(f"⚠️ TTS {name} warm-up failed: {e}")
+
+
+def tts_health() -> dict:
+    """Circuit state per backend in the fallback chain."""
+    return {name: breaker.state() for name, breaker in _breakers.items()}
 
 
 # =========================================================
 # OPENING / INTRO (FOR MOBILE PLAYBACK)
 # =========================================================
-def synthesize_opening_mp3(text: str) -> bytes:
+def synthesize_opening_mp3(text: str, output_format: str = None) -> bytes:
     """
     Synthesize opening/intro text (e.g. from get_opening) to MP3 bytes.
     Use this to send audio to the mobile so the opening is heard on device.
     """
-    return synthesize_mp3(
+    return synthesize_resilient_mp3(
         text,
         role="primary",
         question_type=QuestionType.INTRO,
         confidence=0.7,
+        output_format=output_format,
     )
 
 
-def synthesize_question_mp3(text: str) -> bytes:
+def synthesize_question_mp3(text: str, output_format: str = None) -> bytes:
     """
     Synthesize LLM-generated question/follow-up text to MP3 bytes.
     Use this so every interviewer question is heard on the mobile, not just the opening.
     """
-    return synthesize_mp3(
+    return synthesize_resilient_mp3(
         text,
         role="primary",
         question_type=QuestionType.FOLLOWUP,
         confidence=0.7,
+        output_format=output_format,
     )
 
 
-def synthesize_closing_mp3(text: str) -> bytes:
+def synthesize_closing_mp3(text: str, output_format: str = None) -> bytes:
     """
     Synthesize closing/thank-you text to MP3 bytes (heard on mobile when interview ends).
     """
-    return synthesize_mp3(
+    return synthesize_resilient_mp3(
         text,
         role="primary",
         question_type=QuestionType.CLOSING,
         confidence=0.7,
+        output_format=output_format,
     )
 
 
+def prewarm_formats() -> list:
+    """Every format negotiate_format returns for the known clients (and for none)."""
+    formats = [negotiate_format(prefs) for prefs in CLIENT_FORMAT_PREFERENCES.values()]
+    formats.append(negotiate_format(None))
+    return list(dict.fromkeys(formats))
+
+
+def prewarm_cache(roles=COMMON_ROLES, formats=None) -> int:
+    """
+    Synthesize the opening for each role and the closing into the cache, per format
+    (default: every format a client can negotiate, see prewarm_formats).
+    """
+    from interview_engine import get_opening, get_closing
+
+    formats = formats or prewarm_formats()
+
+    texts = [(synthesize_opening_mp3, get_opening(r)) for r in roles]
+    texts.append((synthesize_closing_mp3, get_closing()))
+    for fmt in formats:
+        for synth, text in texts:
+            synth(text, output_format=fmt)
+            print(f"✅ Cached ({fmt}): {text[:60]}")
+    return len(texts) * len(formats)
+
+
 # =========================================================
-# DEMO (FILE WRITE ONLY)
+# DEMO (FILE WRITE ONLY) / CACHE PRE-WARM
 # =========================================================
 if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="TTS demo and cache pre-warm.")
+    parser.add_argument("--prewarm", action="store_true",
+                        help="Cache opening/closing audio for the common roles and exit")
+    parser.add_argument("--role", action="append",
+                        help="Role to pre-warm (repeatable; default: all common roles)")
+    parser.add_argument("--format", action="append",
+                        help="Output format to pre-warm (repeatable; default: every format clients negotiate)")
+    args = parser.parse_args()
+
+    if args.prewarm:
+        n = prewarm_cache(args.role or COMMON_ROLES, args.format)
+        print(f"✅ Pre-warmed {n} lines; cache: {tts_cache.stats()}")
+        raise SystemExit(0)
+
     audio = synthesize_mp3(
         "Can you explain how a hash map handles collisions?",
         role="primary",
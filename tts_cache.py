@@ -0,0 +1,47 @@
+"""
+On-disk cache of synthesized interviewer audio in tts_cache/.
+Entries are keyed by everything that changes the audio (text, voice id, model id,
+output format, voice settings), so repeated lines such as the opening and closing are
+served without a network round trip. Least recently used files are evicted once
+TTS_CACHE_MAX_BYTES is exceeded (see disk_lru).
+"""
+import hashlib
+import json
+import os
+from pathlib import Path
+
+from disk_lru import DiskLRU
+
+_SCRIPT_DIR = Path(__file__).resolve().parent
+CACHE_DIR = _SCRIPT_DIR / "tts_cache"
+MAX_BYTES = int(os.getenv("TTS_CACHE_MAX_BYTES", str(200 * 1024 * 1024)))
+
+
+def tts_cache_key(text: str, voice_id: str, model_id: str, output_format: str,
+                  settings: dict) -> str:
+    payload = {
+        "text": text,
+        "voice_id": voice_id,
+        "model_id": model_id,
+        "output_format": output_format,
+        "voice_settings": settings,
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode("utf-8")).hexdigest()
+
+
+class TTSCache(DiskLRU):
+    default_ext = "mp3"
+
+    def __init__(self, cache_dir: Path = CACHE_DIR, max_bytes: int = MAX_BYTES):
+        super().__init__(cache_dir, max_bytes)
+
+    def get(self, key: str):
+        """Cached audio bytes for key, or None."""
+        return self.read(key)
+
+    def put(self, key: str, data: bytes, ext: str = "mp3") -> None:
+        self.write(key, data, ext=ext)
+
+
+# Shared by all synthesize_* calls in this process
+tts_cache = TTSCache()
@@ -0,0 +1,94 @@
+"""
+Failure handling for TTS providers: per-call deadlines with hedged retries, and a
+circuit breaker per backend so a provider that is out of quota or rejecting the key is
+skipped (and the fallback voice used) instead of being retried on every question.
+"""
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+FAILURE_THRESHOLD = 3        # consecutive failures before the breaker opens
+RESET_SECONDS = 30.0         # open -> half-open after this long
+FATAL_RESET_SECONDS = 600.0  # auth / quota errors keep the breaker open longer
+
+# Attempts keep running after a deadline; their audio still lands in the TTS cache
+_executor = ThreadPoolExecutor(max_workers=8, thread_name_prefix="tts")
+
+
+def is_fatal_tts_error(error: Exception) -> bool:
+    """401/402/403 or an exhausted quota: retrying will not help for a while."""
+    status = getattr(error, "status_code", None)
+    text = f"{getattr(error, 'body', '')} {error}".lower()
+    return status in (401, 402, 403) or "quota" in text
+
+
+class CircuitBreaker:
+    def __init__(self, name: str, failure_threshold: int = FAILURE_THRESHOLD,
+                 reset_seconds: float = RESET_SECONDS):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._open_until = 0.0
+
+    def allow(self) -> bool:
+        """False while open; after the cool-down one trial call is let through (half-open)."""
+        with self._lock:
+            now = time.monotonic()
+            if now < self._open_until:
+                return False
+            if self._open_until:
+                # half-open: let this call probe, keep others out until it reports back
+                self._open_until = now + self.reset_seconds
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            self._failures = 0
+            self._open_until = 0.0
+
+    def record_failure(self, fatal: bool = False) -> None:
+        with self._lock:
+            self._failures += 1
+            if fatal or self._failures >= self.failure_threshold:
+                cool_down = FATAL_RESET_SECONDS if fatal else self.reset_seconds
+                self._open_until = time.monotonic() + cool_down
+                print(f"⚠️ TTS circuit for {self.name} open for {cool_down:.0f}s")
+
+    def state(self) -> str:
+        with self._lock:
+            if not self._open_until:
+                return "closed"
+            return "open" if time.monotonic() < self._open_until else "half-open"
+
+
+def hedged_call(fn, deadline: float, hedge_after: float, max_attempts: int = 2,
+                is_fatal=is_fatal_tts_error):
+    """
+    Run fn() within deadline seconds. If no answer arrives after hedge_after seconds, or
+    the attempt fails with nothing else in flight, start another attempt (up to
+    max_attempts) and return whichever succeeds first. Raises TimeoutError at the deadline.
+    """
+    end = time.monotonic() + deadline
+    pending = {_executor.submit(fn)}
+    attempts = 1
+    last_error = None
+    while True:
+        remaining = end - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"TTS deadline of {deadline:.1f}s exceeded") from last_error
+        timeout = min(remaining, hedge_after) if attempts < max_attempts else remaining
+        done, pending = wait(pending, timeout=timeout, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                return future.result()
+            last_error = future.exception()
+            if is_fatal(last_error):
+                raise last_error
+        if attempts < max_attempts and (not done or not pending):
+            # slow (no answer yet) or failed with nothing in flight: send another request
+            pending.add(_executor.submit(fn))
+            attempts += 1
+        elif not pending:
+            raise last_error